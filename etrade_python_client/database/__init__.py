@@ -1,6 +1,6 @@
 """Database module for AI trading assistant."""
 
-from .database import get_db_session, init_database
+from .database import get_db_session, init_database, session_scope
 from .models import (
     PortfolioAnalytics,
     AIDecision,
@@ -13,6 +13,7 @@ from .models import (
 __all__ = [
     'get_db_session',
     'init_database',
+    'session_scope',
     'PortfolioAnalytics',
     'AIDecision',
     'MarketSentiment',
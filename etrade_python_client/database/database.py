@@ -1,10 +1,17 @@
 """Database connection and session management for AI trading assistant."""
 
 import os
+import re
 import asyncio
+import logging
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from datetime import datetime
+from typing import Any, AsyncContextManager, AsyncGenerator, Dict, List
 
+import orjson
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import (
     AsyncSession, 
     async_sessionmaker, 
@@ -14,15 +21,67 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import sessionmaker
 
 try:
-    from ..utils.config_manager import ConfigManager
-    from .models import Base
+    from ..utils.config_manager import get_config_manager
+    from .models import Base, PortfolioAnalytics
+    from .schema_upgrade import upgrade_schema
 except ImportError:
     # Fallback for direct execution
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from utils.config_manager import ConfigManager
-    from database.models import Base
+    from utils.config_manager import get_config_manager
+    from database.models import Base, PortfolioAnalytics
+    from database.schema_upgrade import upgrade_schema
+
+logger = logging.getLogger(__name__)
+
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {
+    'postgresql': pg_insert,
+    'sqlite': sqlite_insert
+}
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON columns with orjson (Decimal is not native to orjson, so it falls back to str)."""
+    return orjson.dumps(value, default=str).decode()
+
+
+# Per-connection SQLite tuning: WAL lets readers run alongside the writer and
+# synchronous=NORMAL avoids an fsync on every commit
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLite performance pragmas to a new connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+# Compiled SQL kept per engine; the tasks and API together use well over the default 500 statement shapes
+_QUERY_CACHE_SIZE = 2048
+
+
+# Timeseries tables range-partitioned by month on PostgreSQL
+_MONTHLY_PARTITIONED_TABLES = ('portfolio_analytics', 'ai_decisions')
+_PARTITION_SUFFIX_RE = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    """Return the first instant of the month `offset` months after value's month."""
+    month_index = value.year * 12 + value.month - 1 + offset
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
 
 
 class DatabaseManager:
@@ -31,31 +90,131 @@ class DatabaseManager:
     def __init__(self):
         self.engine: AsyncEngine | None = None
         self.async_session_maker: async_sessionmaker[AsyncSession] | None = None
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config_manager()
+        self._init_lock = asyncio.Lock()
     
     async def init_database(self):
-        """Initialize database connection and create tables."""
+        """Initialize database connection and create tables (only the first call does any work)."""
+        if self.async_session_maker is not None:
+            return
+        async with self._init_lock:
+            if self.async_session_maker is None:
+                await self._init_database()
+    
+    async def _init_database(self):
+        """Create the engine, tables and partitions."""
         database_url = self.config_manager.get_database_url()
         
         # Convert SQLite URL to async format
         if database_url.startswith('sqlite:///'):
             database_url = database_url.replace('sqlite:///', 'sqlite+aiosqlite:///')
         
-        self.engine = create_async_engine(
-            database_url,
-            echo=self.config_manager.is_debug_enabled(),
-            future=True
-        )
+        engine_kwargs = {
+            'echo': self.config_manager.is_debug_enabled(),
+            'future': True,
+            'json_serializer': _json_serializer,
+            'json_deserializer': orjson.loads,
+            'query_cache_size': _QUERY_CACHE_SIZE
+        }
+
+        # SQLite uses its own pool class; QueuePool tuning only applies to server databases
+        if not database_url.startswith('sqlite'):
+            engine_kwargs.update(
+                pool_use_lifo=True,
+                pool_size=self.config_manager.get_db_pool_size(),
+                max_overflow=self.config_manager.get_db_max_overflow(),
+                pool_pre_ping=True,
+                pool_recycle=self.config_manager.get_db_pool_recycle()
+            )
+
+        self.engine = create_async_engine(database_url, **engine_kwargs)
+        
+        if database_url.startswith('sqlite'):
+            event.listen(self.engine.sync_engine, 'connect', _set_sqlite_pragmas)
+        
+        # Create missing tables, then bring tables from older versions up to the current schema
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(upgrade_schema)
         
+        await self.ensure_monthly_partitions()
+        
+        # Publish the session maker last, so concurrent callers never see a half-initialized database
         self.async_session_maker = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
             expire_on_commit=False
         )
+    
+    async def ensure_monthly_partitions(self, months_ahead: int = 3):
+        """Create monthly partitions for the current month and the next few (PostgreSQL only)."""
+        if self.engine.dialect.name != 'postgresql':
+            return
         
-        # Create all tables
+        now = datetime.now()
         async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            result = await conn.execute(text(
+                "SELECT pg_class.relname FROM pg_partitioned_table "
+                "JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid"
+            ))
+            partitioned_tables = set(result.scalars())
+            
+            for table in _MONTHLY_PARTITIONED_TABLES:
+                # Tables created before partitioning stay plain; retention falls back to row deletes
+                if table not in partitioned_tables:
+                    logger.warning(
+                        f"⚠️ {table} is not partitioned; rebuild it from migrations/initial_schema.sql "
+                        f"to enable monthly partitions"
+                    )
+                    continue
+                
+                # Catch-all for rows outside the pre-created ranges (e.g. backfills)
+                await conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+                ))
+                for offset in range(months_ahead + 1):
+                    start = _month_start(now, offset)
+                    end = _month_start(now, offset + 1)
+                    await conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {table}_{start:%Y_%m} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+                    ))
+    
+    async def drop_expired_partitions(self, table: str, cutoff: datetime) -> int:
+        """Drop monthly partitions of table whose whole range is older than cutoff.
+        
+        Args:
+            table: Partitioned parent table name
+            cutoff: Rows older than this are expired
+            
+        Returns:
+            Number of partitions dropped (always 0 outside PostgreSQL)
+        """
+        if self.engine.dialect.name != 'postgresql':
+            return 0
+        
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE parent.relname = :table"
+                ),
+                {'table': table}
+            )
+            
+            dropped = 0
+            for partition in result.scalars():
+                match = _PARTITION_SUFFIX_RE.search(partition)
+                if match is None:
+                    continue
+                partition_end = _month_start(datetime(int(match.group(1)), int(match.group(2)), 1), 1)
+                if partition_end <= cutoff:
+                    await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+                    await conn.execute(text(f"DROP TABLE {partition}"))
+                    dropped += 1
+            return dropped
     
     @asynccontextmanager
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
@@ -63,20 +222,17 @@ class DatabaseManager:
         if not self.async_session_maker:
             raise RuntimeError("Database not initialized. Call init_database() first.")
         
+        # begin() commits on success and rolls back on error; the outer block closes the session
         async with self.async_session_maker() as session:
-            try:
+            async with session.begin():
                 yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
-            finally:
-                await session.close()
     
     async def close(self):
         """Close database connections."""
         if self.engine:
             await self.engine.dispose()
+            self.engine = None
+            self.async_session_maker = None
 
 
 # Global database manager instance
@@ -89,45 +245,86 @@ async def init_database():
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get a database session for dependency injection."""
-    async with _db_manager.get_session() as session:
+    """Get a database session for dependency injection.
+    
+    FastAPI runs this teardown only after the response is sent, so endpoints commit their
+    own writes before responding; anything left uncommitted is rolled back on close.
+    """
+    if not _db_manager.async_session_maker:
+        raise RuntimeError("Database not initialized. Call init_database() first.")
+    
+    async with _db_manager.async_session_maker() as session:
         yield session
 
 
+def session_scope() -> AsyncContextManager[AsyncSession]:
+    """Open a transactional session as an async context manager, for code outside FastAPI."""
+    return _db_manager.get_session()
+
+
+async def ensure_monthly_partitions(months_ahead: int = 3):
+    """Create upcoming monthly partitions for the timeseries tables."""
+    await _db_manager.ensure_monthly_partitions(months_ahead)
+
+
+async def drop_expired_partitions(table: str, cutoff: datetime) -> int:
+    """Drop monthly partitions of table that are entirely older than cutoff."""
+    return await _db_manager.drop_expired_partitions(table, cutoff)
+
+
 async def close_database():
     """Close database connections."""
     await _db_manager.close()
 
 
+# Seed values for the default user preferences row
+_DEFAULT_USER_PREFERENCES = {
+    "notification_preferences": {
+        "email_enabled": True,
+        "slack_enabled": True,
+        "trading_alerts": True,
+        "daily_summary": True
+    },
+    "watchlist_symbols": ["AAPL", "MSFT", "GOOGL", "TSLA"]
+}
+
+
 # Utility function for creating default user preferences
 async def create_default_user_preferences() -> str:
     """Create default user preferences and return user_id."""
     from .models import UserPreferences
     
+    default_row = select(UserPreferences.user_id).where(UserPreferences.is_default.is_(True))
+    
     async with _db_manager.get_session() as session:
-        # Check if any user preferences exist
-        existing_prefs = await session.execute(
-            "SELECT COUNT(*) FROM user_preferences"
-        )
-        if existing_prefs.scalar() > 0:
-            # Return existing user_id
-            result = await session.execute(
-                "SELECT user_id FROM user_preferences LIMIT 1"
-            )
-            return result.scalar()
+        insert_stmt = _UPSERT_INSERTS.get(_db_manager.engine.dialect.name)
+        if insert_stmt is None:
+            # No ON CONFLICT support: check first, then insert (the unique index rejects a racing duplicate)
+            user_id = (await session.execute(default_row)).scalar_one_or_none()
+            if user_id is not None:
+                return user_id
+            preferences = UserPreferences(is_default=True, **_DEFAULT_USER_PREFERENCES)
+            session.add(preferences)
+            await session.flush()
+            return preferences.user_id
         
-        # Create new default preferences
-        default_prefs = UserPreferences(
-            notification_preferences={
-                "email_enabled": True,
-                "slack_enabled": True,
-                "trading_alerts": True,
-                "daily_summary": True
-            },
-            watchlist_symbols=["AAPL", "MSFT", "GOOGL", "TSLA"]
+        # Seed the default row unless one already exists (unique on is_default)
+        result = await session.execute(
+            insert_stmt(UserPreferences)
+            .values(is_default=True, **_DEFAULT_USER_PREFERENCES)
+            .on_conflict_do_nothing(index_elements=[UserPreferences.is_default])
+            .returning(UserPreferences.user_id)
         )
+        user_id = result.scalar_one_or_none()
+        if user_id is not None:
+            return user_id
         
-        session.add(default_prefs)
-        await session.flush()
-        
-        return default_prefs.user_id
\ No newline at end of file
+        # Default row already existed
+        result = await session.execute(default_row)
+        return result.scalar_one()
+
+
+async def bulk_insert_analytics(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Insert many portfolio analytics snapshots with a single executemany INSERT."""
+    if rows:
+        await session.execute(insert(PortfolioAnalytics), rows)
@@ -1,15 +1,18 @@
 -- Initial schema for AI Trading Assistant Database
 -- This SQL script creates the initial database schema
+-- On PostgreSQL, portfolio_analytics and ai_decisions are range-partitioned by month;
+-- partitions are created by ensure_monthly_partitions() in database.py
 
 -- Portfolio Analytics Table
 CREATE TABLE IF NOT EXISTS portfolio_analytics (
-    portfolio_id VARCHAR(36) PRIMARY KEY,
+    portfolio_id VARCHAR(36) NOT NULL,
     account_id VARCHAR(100) NOT NULL,
     timestamp DATETIME NOT NULL,
-    total_value DECIMAL(15,2) NOT NULL,
-    daily_change DECIMAL(15,2) NOT NULL,
+    total_value_cents BIGINT NOT NULL,
+    daily_change_cents BIGINT NOT NULL,
     positions JSON NOT NULL,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (portfolio_id, timestamp)
 );
 
 CREATE INDEX IF NOT EXISTS idx_portfolio_account ON portfolio_analytics(account_id);
@@ -17,22 +20,27 @@ CREATE INDEX IF NOT EXISTS idx_portfolio_timestamp ON portfolio_analytics(timest
 
 -- AI Decisions Table
 CREATE TABLE IF NOT EXISTS ai_decisions (
-    decision_id VARCHAR(36) PRIMARY KEY,
+    decision_id VARCHAR(36) NOT NULL,
     symbol VARCHAR(20) NOT NULL,
     decision_type VARCHAR(10) NOT NULL,
     confidence_score REAL NOT NULL,
     rationale TEXT NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     executed_at DATETIME,
-    outcome_value DECIMAL(15,2),
+    outcome_value_cents BIGINT,
     user_feedback VARCHAR(10),
     feedback_notes TEXT,
     feedback_timestamp DATETIME,
-    price_target DECIMAL(10,2)
+    price_target_cents BIGINT,
+    sentiment_score_at_decision REAL,
+    portfolio_value_at_decision_cents BIGINT,
+    PRIMARY KEY (decision_id, created_at)
 );
 
-CREATE INDEX IF NOT EXISTS idx_decisions_symbol ON ai_decisions(symbol);
+CREATE INDEX IF NOT EXISTS idx_decisions_symbol_created ON ai_decisions(symbol, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_decisions_created ON ai_decisions(created_at);
+CREATE INDEX IF NOT EXISTS idx_decisions_type_executed_confidence ON ai_decisions(decision_type, executed_at, confidence_score DESC);
+CREATE INDEX IF NOT EXISTS idx_decisions_feedback_timestamp ON ai_decisions(user_feedback, feedback_timestamp DESC);
 
 -- Market Sentiment Table
 CREATE TABLE IF NOT EXISTS market_sentiment (
@@ -44,7 +52,7 @@ CREATE TABLE IF NOT EXISTS market_sentiment (
     analyzed_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_sentiment_symbol ON market_sentiment(symbol);
+CREATE INDEX IF NOT EXISTS idx_sentiment_symbol_analyzed ON market_sentiment(symbol, analyzed_at DESC);
 CREATE INDEX IF NOT EXISTS idx_sentiment_analyzed ON market_sentiment(analyzed_at);
 
 -- User Preferences Table
@@ -55,6 +63,7 @@ CREATE TABLE IF NOT EXISTS user_preferences (
     notification_preferences JSON NOT NULL DEFAULT '{}',
     watchlist_symbols JSON NOT NULL DEFAULT '[]',
     auto_trading_enabled BOOLEAN NOT NULL DEFAULT 1,
+    is_default BOOLEAN UNIQUE,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -1,22 +1,59 @@
 """SQLAlchemy models for AI trading assistant database."""
 
+import os
+import time
 import uuid
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 from typing import Optional
 
 from sqlalchemy import (
-    Boolean, DateTime, Enum as SQLEnum, Float, Integer, 
-    String, Text, JSON, DECIMAL, UUID
+    BigInteger, Boolean, DateTime, Enum as SQLEnum, Float, Index, Integer, 
+    String, Text, JSON, DECIMAL, UUID, text
 )
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
 
+def uuid7() -> str:
+    """Generate a time-ordered UUIDv7 string so new primary keys append to the index."""
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+
+# SQLite's CURRENT_TIMESTAMP writes whole seconds; storing created_at keys in the same format keeps
+# the server-generated value identical when the ORM binds it back in an UPDATE's primary key clause
+_SQLITE_SECONDS_DATETIME = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
+
+class Cents(TypeDecorator):
+    """Monetary amount stored as integer cents and exposed as a 2-place Decimal."""
+    
+    impl = BigInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return int((Decimal(str(value)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    
+    def process_result_value(self, value, dialect) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-2)
+
+
 class DecisionType(str, Enum):
     """AI decision types for trading recommendations."""
     BUY = "BUY"
@@ -43,12 +80,14 @@ class PortfolioAnalytics(Base):
     """Portfolio analytics and historical performance tracking."""
     
     __tablename__ = "portfolio_analytics"
+    # Monthly partitions on Postgres (see ensure_monthly_partitions); the key must be part of the PK
+    __table_args__ = {"postgresql_partition_by": "RANGE (timestamp)"}
     
-    portfolio_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    portfolio_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=uuid7)
     account_id: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
-    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
-    total_value: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
-    daily_change: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, index=True)
+    total_value: Mapped[Decimal] = mapped_column("total_value_cents", Cents, nullable=False)
+    daily_change: Mapped[Decimal] = mapped_column("daily_change_cents", Cents, nullable=False)
     positions: Mapped[dict] = mapped_column(JSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
@@ -57,28 +96,66 @@ class AIDecision(Base):
     """AI trading decisions and recommendations with user feedback."""
     
     __tablename__ = "ai_decisions"
+    __table_args__ = (
+        # Per-symbol history ordered newest first; covering on Postgres
+        Index(
+            "ix_ai_decisions_symbol_created_at",
+            "symbol",
+            text("created_at DESC"),
+            postgresql_include=["decision_type", "confidence_score"]
+        ),
+        # Pending trade lookup in execute_etrade_trades
+        Index(
+            "ix_ai_decisions_type_executed_confidence",
+            "decision_type",
+            "executed_at",
+            text("confidence_score DESC")
+        ),
+        # Recent feedback aggregation in optimize_ai_learning
+        Index(
+            "ix_ai_decisions_feedback_timestamp",
+            "user_feedback",
+            text("feedback_timestamp DESC")
+        ),
+        # Monthly partitions on Postgres (see ensure_monthly_partitions); the key must be part of the PK
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
-    decision_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
-    symbol: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    decision_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=uuid7)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
     decision_type: Mapped[DecisionType] = mapped_column(SQLEnum(DecisionType), nullable=False)
     confidence_score: Mapped[float] = mapped_column(Float, nullable=False)
     rationale: Mapped[str] = mapped_column(Text, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True).with_variant(_SQLITE_SECONDS_DATETIME, "sqlite"),
+        primary_key=True, server_default=func.now(), index=True
+    )
     executed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    outcome_value: Mapped[Optional[Decimal]] = mapped_column(DECIMAL(15, 2), nullable=True)
+    outcome_value: Mapped[Optional[Decimal]] = mapped_column("outcome_value_cents", Cents, nullable=True)
     user_feedback: Mapped[Optional[UserFeedback]] = mapped_column(SQLEnum(UserFeedback), nullable=True)
     feedback_notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     feedback_timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    price_target: Mapped[Optional[Decimal]] = mapped_column(DECIMAL(10, 2), nullable=True)
+    price_target: Mapped[Optional[Decimal]] = mapped_column("price_target_cents", Cents, nullable=True)
+    # Snapshots taken when the decision is made, so reads avoid joining sentiment/portfolio tables
+    sentiment_score_at_decision: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    portfolio_value_at_decision: Mapped[Optional[Decimal]] = mapped_column("portfolio_value_at_decision_cents", Cents, nullable=True)
 
 
 class MarketSentiment(Base):
     """Market sentiment analysis from news and social media."""
     
     __tablename__ = "market_sentiment"
+    __table_args__ = (
+        Index(
+            "ix_market_sentiment_symbol_analyzed_at",
+            "symbol",
+            text("analyzed_at DESC"),
+            postgresql_include=["sentiment_score"]
+        ),
+    )
     
-    sentiment_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
-    symbol: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    sentiment_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=uuid7)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
     sentiment_score: Mapped[float] = mapped_column(Float, nullable=False)
     news_summary: Mapped[str] = mapped_column(Text, nullable=False)
     source_count: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -90,12 +167,13 @@ class UserPreferences(Base):
     
     __tablename__ = "user_preferences"
     
-    user_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=uuid7)
     risk_tolerance: Mapped[RiskTolerance] = mapped_column(SQLEnum(RiskTolerance), nullable=False, default=RiskTolerance.MODERATE)
     max_trade_amount: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False, default=Decimal('1000.00'))
     notification_preferences: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
     watchlist_symbols: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
     auto_trading_enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    is_default: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True, unique=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -105,7 +183,7 @@ class AILearningContext(Base):
     
     __tablename__ = "ai_learning_context"
     
-    context_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    context_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=uuid7)
     version: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     learning_parameters: Mapped[dict] = mapped_column(JSON, nullable=False)
     feedback_summary: Mapped[dict] = mapped_column(JSON, nullable=False)
@@ -119,7 +197,7 @@ class BackupLog(Base):
     
     __tablename__ = "backup_logs"
     
-    backup_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    backup_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=uuid7)
     backup_filename: Mapped[str] = mapped_column(String(255), nullable=False)
     backup_path: Mapped[str] = mapped_column(String(500), nullable=False)
     backup_size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
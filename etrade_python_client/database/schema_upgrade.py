@@ -0,0 +1,139 @@
+"""In-place upgrades for databases created before the current schema.
+
+Base.metadata.create_all only creates missing tables, so columns, constraints and
+indexes added to existing tables are applied here. Every step inspects the live
+schema first, so the upgrade is safe to run on each start.
+"""
+
+import logging
+from typing import Set
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+try:
+    from .models import Base
+except ImportError:
+    from database.models import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _column_names(connection: Connection, table: str) -> Set[str]:
+    """Return the column names of an existing table."""
+    return {column['name'] for column in inspect(connection).get_columns(table)}
+
+
+# Money columns renamed when they moved from DECIMAL to integer cents (see models.Cents)
+_CENTS_COLUMN_RENAMES = (
+    ('portfolio_analytics', 'total_value', 'total_value_cents'),
+    ('portfolio_analytics', 'daily_change', 'daily_change_cents'),
+    ('ai_decisions', 'outcome_value', 'outcome_value_cents'),
+    ('ai_decisions', 'price_target', 'price_target_cents'),
+)
+
+
+def _convert_cents_columns(connection: Connection):
+    """Rename legacy DECIMAL money columns to their *_cents names and rescale the values to cents."""
+    existing_tables = set(inspect(connection).get_table_names())
+    
+    for table, old_name, new_name in _CENTS_COLUMN_RENAMES:
+        if table not in existing_tables:
+            continue
+        columns = _column_names(connection, table)
+        if old_name not in columns or new_name in columns:
+            continue
+        
+        connection.execute(text(f"ALTER TABLE {table} RENAME COLUMN {old_name} TO {new_name}"))
+        if connection.dialect.name == 'postgresql':
+            connection.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {new_name} TYPE BIGINT USING ROUND({new_name} * 100)::BIGINT"
+            ))
+        else:
+            # SQLite columns are dynamically typed, so the rescaled integers are stored as-is
+            connection.execute(text(
+                f"UPDATE {table} SET {new_name} = CAST(ROUND({new_name} * 100) AS INTEGER) "
+                f"WHERE {new_name} IS NOT NULL"
+            ))
+        logger.info(f"🔧 Converted {table}.{old_name} to cents as {new_name}")
+
+
+def _add_missing_columns(connection: Connection):
+    """Add nullable model columns that are missing from existing tables."""
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = _column_names(connection, table.name)
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                raise RuntimeError(
+                    f"Cannot add required column {table.name}.{column.name} to an existing table; "
+                    f"rebuild the database from migrations/initial_schema.sql"
+                )
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            logger.info(f"🔧 Added column {table.name}.{column.name}")
+
+
+def _mark_default_user_preferences(connection: Connection):
+    """Back the is_default upsert with a unique index and mark the oldest legacy row as default."""
+    inspector = inspect(connection)
+    unique_column_sets = [
+        constraint['column_names'] for constraint in inspector.get_unique_constraints('user_preferences')
+    ] + [
+        index['column_names'] for index in inspector.get_indexes('user_preferences') if index['unique']
+    ]
+    if ['is_default'] not in unique_column_sets:
+        connection.execute(text(
+            "CREATE UNIQUE INDEX uq_user_preferences_is_default ON user_preferences (is_default)"
+        ))
+    
+    has_default = connection.execute(
+        text("SELECT 1 FROM user_preferences WHERE is_default = :is_default LIMIT 1"),
+        {'is_default': True}
+    ).first()
+    if has_default is None:
+        result = connection.execute(
+            text(
+                "UPDATE user_preferences SET is_default = :is_default WHERE user_id = "
+                "(SELECT user_id FROM user_preferences ORDER BY created_at, user_id LIMIT 1)"
+            ),
+            {'is_default': True}
+        )
+        if result.rowcount:
+            logger.info("🔧 Marked existing user preferences as the default row")
+
+
+def _create_missing_indexes(connection: Connection):
+    """Create model indexes that are missing from existing tables."""
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                logger.info(f"🔧 Created index {index.name}")
+
+
+# Applied in order; later steps rely on the columns added by earlier ones
+_UPGRADE_STEPS = (
+    _convert_cents_columns,
+    _add_missing_columns,
+    _mark_default_user_preferences,
+    _create_missing_indexes,
+)
+
+
+def upgrade_schema(connection: Connection):
+    """Bring tables created by an older version of the models up to the current schema."""
+    for step in _UPGRADE_STEPS:
+        step(connection)
@@ -1,45 +1,235 @@
 """AI Trading Service using Google Gemini for analysis and decision making."""
 
-import json
-import asyncio
+import re
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
 from datetime import datetime
 from decimal import Decimal
 
 import google.generativeai as genai
+import numpy as np
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from ..database.models import AIDecision, MarketSentiment, UserPreferences, DecisionType
-from ..utils.config_manager import ConfigManager
+from ..utils.config_manager import get_config_manager
 
 logger = logging.getLogger(__name__)
 
+# Prompt skeletons are built once at import; only the data is substituted per call
+_SENTIMENT_PROMPT = """
+Analyze the market sentiment for {symbol} based on the following data:
+
+Market Data:
+{market_data}
+
+Recent News:
+{news}
+
+Please provide:
+1. A sentiment score between -1.0 (very negative) and 1.0 (very positive)
+2. A brief analysis summary explaining the sentiment
+
+Format your response as JSON:
+{{
+    "sentiment_score": 0.0,
+    "summary": "Analysis summary here"
+}}
+"""
+
+_DECISION_PROMPT = """
+You are an expert AI trading advisor. Analyze the following data for {symbol} and provide a trading recommendation:
+
+Portfolio Data:
+{portfolio_data}
+
+Market Data:
+{market_data}
+
+Sentiment Analysis:
+{sentiment_data}
+
+User Preferences:
+- Risk Tolerance: {risk_tolerance}
+- Max Trade Amount: ${max_trade_amount}
+- Auto Trading: {auto_trading_enabled}
+
+Consider:
+1. Technical indicators from market data
+2. Market sentiment and news impact
+3. Portfolio diversification
+4. Risk management based on user preferences
+5. Current market conditions
+
+Provide a recommendation in JSON format:
+{{
+    "decision": "BUY|SELL|HOLD",
+    "confidence": 0.85,
+    "rationale": "Detailed explanation of the decision",
+    "price_target": 150.00,
+    "risk_assessment": "LOW|MEDIUM|HIGH"
+}}
+
+Only recommend BUY/SELL if confidence > 0.7 and the decision aligns with user risk tolerance.
+"""
+
+_SENTIMENT_BATCH_ITEM = """
+Symbol: {symbol}
+Market Data:
+{market_data}
+Recent News:
+{news}
+"""
+
+_SENTIMENT_BATCH_PROMPT = """
+Analyze the market sentiment for each of the following symbols:
+{symbols}
+For each symbol provide:
+1. A sentiment score between -1.0 (very negative) and 1.0 (very positive)
+2. A brief analysis summary explaining the sentiment
+
+Format your response as a JSON array with one entry per symbol:
+[
+    {{
+        "symbol": "SYMBOL",
+        "sentiment_score": 0.0,
+        "summary": "Analysis summary here"
+    }}
+]
+"""
+
+# Keyword sets for the rule-based fallback sentiment analysis
+_POSITIVE_WORDS = frozenset({'up', 'gain', 'rise', 'bull', 'positive', 'strong', 'growth'})
+_NEGATIVE_WORDS = frozenset({'down', 'fall', 'drop', 'bear', 'negative', 'weak', 'decline'})
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Sorted vocabulary with a +1/-1 sign per word for vectorized token scoring
+_SENTIMENT_VOCAB = np.array(sorted(_POSITIVE_WORDS | _NEGATIVE_WORDS))
+_SENTIMENT_SIGNS = np.array(
+    [1 if word in _POSITIVE_WORDS else -1 for word in _SENTIMENT_VOCAB], dtype=np.int8
+)
+
+# Gemini model shared by every AITradingService in the process
+_model: Optional[genai.GenerativeModel] = None
+_model_initialized = False
+_model_lock = threading.Lock()
+
+
+def _initialize_gemini() -> Optional[genai.GenerativeModel]:
+    """Initialize Google Gemini AI model."""
+    try:
+        api_key = get_config_manager().get_gemini_api_key()
+        if api_key == "your_gemini_api_key":
+            logger.warning("⚠️ Gemini API key not configured. AI features will be limited.")
+            return None
+        
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel('gemini-1.5-flash')
+        logger.info("✅ Gemini AI model initialized successfully")
+        return model
+        
+    except Exception as e:
+        logger.error(f"❌ Failed to initialize Gemini: {e}")
+        return None
+
+
+def _get_model() -> Optional[genai.GenerativeModel]:
+    """Return the shared Gemini model, configuring the SDK once per process."""
+    global _model, _model_initialized
+    
+    if not _model_initialized:
+        with _model_lock:
+            if not _model_initialized:
+                _model = _initialize_gemini()
+                _model_initialized = True
+    return _model
+
+
+def _count_sentiment_words(text: str) -> Tuple[int, int]:
+    """Count positive and negative keyword occurrences in lowercased text."""
+    tokens = np.array(_WORD_RE.findall(text))
+    if tokens.size == 0:
+        return 0, 0
+    
+    # Map each token to its vocabulary slot and keep only exact matches
+    idx = np.minimum(np.searchsorted(_SENTIMENT_VOCAB, tokens), _SENTIMENT_VOCAB.size - 1)
+    signs = _SENTIMENT_SIGNS[idx[_SENTIMENT_VOCAB[idx] == tokens]]
+    
+    return int(np.count_nonzero(signs > 0)), int(np.count_nonzero(signs < 0))
+
+
+# Gemini often wraps JSON in ```json fences or prose; grab the outermost object/array
+_JSON_RE = re.compile(r"[\[{].*[\]}]", re.S)
+
+
+# Optional keys live in total=False bases (NotRequired needs Python 3.11)
+class _SentimentPayloadOptional(TypedDict, total=False):
+    """Optional keys of a Gemini sentiment response."""
+    summary: str
+    symbol: str
+
+
+class _SentimentPayload(_SentimentPayloadOptional):
+    """Expected shape of a Gemini sentiment response."""
+    sentiment_score: float
+
+
+class _DecisionPayloadOptional(TypedDict, total=False):
+    """Optional keys of a Gemini trading decision response."""
+    confidence: float
+    rationale: str
+    price_target: Optional[float]
+    risk_assessment: str
+
+
+class _DecisionPayload(_DecisionPayloadOptional):
+    """Expected shape of a Gemini trading decision response."""
+    decision: str
+
+
+def _parse_json_response(text: str, schema: type, many: bool = False) -> Any:
+    """Extract the JSON payload from a Gemini response and check it against a TypedDict schema.
+    
+    Args:
+        text: Raw response text, possibly wrapped in code fences or prose
+        schema: TypedDict describing the required keys of each object
+        many: Whether the payload is a JSON array of objects
+        
+    Returns:
+        Parsed object, or list of objects when many is True
+    """
+    match = _JSON_RE.search(text)
+    if match is None:
+        raise ValueError("No JSON payload found in Gemini response")
+    
+    payload = orjson.loads(match.group(0))
+    items = payload if many else [payload]
+    if not isinstance(items, list):
+        raise ValueError(f"Expected a JSON array, got {type(payload).__name__}")
+    
+    for item in items:
+        if not isinstance(item, dict) or not schema.__required_keys__ <= item.keys():
+            raise ValueError(f"Gemini response does not match {schema.__name__}: {item!r}")
+    return payload
+
+
+def _to_json(data: Dict) -> str:
+    """Serialize prompt data compactly (Decimal and other extras fall back to str)."""
+    return orjson.dumps(data, default=str).decode()
+
 
 class AITradingService:
     """AI Trading service using Google Gemini for intelligent trading decisions."""
     
     def __init__(self):
-        self.config_manager = ConfigManager()
-        self.model = None
-        self._initialize_gemini()
+        self.config_manager = get_config_manager()
     
-    def _initialize_gemini(self):
-        """Initialize Google Gemini AI model."""
-        try:
-            api_key = self.config_manager.get_gemini_api_key()
-            if api_key == "your_gemini_api_key":
-                logger.warning("⚠️ Gemini API key not configured. AI features will be limited.")
-                return
-            
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-            logger.info("✅ Gemini AI model initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Gemini: {e}")
-            self.model = None
+    @property
+    def model(self) -> Optional[genai.GenerativeModel]:
+        """Process-wide Gemini model, initialized on first use."""
+        return _get_model()
     
     async def analyze_market_sentiment(
         self,
@@ -64,32 +254,16 @@ class AITradingService:
         
         try:
             # Prepare prompt for sentiment analysis
-            prompt = f"""
-            Analyze the market sentiment for {symbol} based on the following data:
-            
-            Market Data:
-            {json.dumps(market_data, indent=2, default=str)}
-            
-            Recent News:
-            {chr(10).join(news_summaries[:5])}  # Limit to 5 news items
-            
-            Please provide:
-            1. A sentiment score between -1.0 (very negative) and 1.0 (very positive)
-            2. A brief analysis summary explaining the sentiment
-            
-            Format your response as JSON:
-            {{
-                "sentiment_score": 0.0,
-                "summary": "Analysis summary here"
-            }}
-            """
-            
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
+            prompt = _SENTIMENT_PROMPT.format(
+                symbol=symbol,
+                market_data=_to_json(market_data),
+                news='\n'.join(news_summaries[:5])  # Limit to 5 news items
             )
             
+            response = await self.model.generate_content_async(prompt)
+            
             # Parse AI response
-            result = json.loads(response.text.strip())
+            result = _parse_json_response(response.text, _SentimentPayload)
             sentiment_score = float(result.get('sentiment_score', 0.0))
             summary = result.get('summary', 'No analysis available')
             
@@ -132,87 +306,135 @@ class AITradingService:
         
         try:
             # Prepare comprehensive prompt
-            prompt = f"""
-            You are an expert AI trading advisor. Analyze the following data for {symbol} and provide a trading recommendation:
-            
-            Portfolio Data:
-            {json.dumps(portfolio_data, indent=2, default=str)}
-            
-            Market Data:
-            {json.dumps(market_data, indent=2, default=str)}
-            
-            Sentiment Analysis:
-            {json.dumps(sentiment_data, indent=2, default=str)}
-            
-            User Preferences:
-            - Risk Tolerance: {user_preferences.risk_tolerance.value}
-            - Max Trade Amount: ${user_preferences.max_trade_amount}
-            - Auto Trading: {user_preferences.auto_trading_enabled}
-            
-            Consider:
-            1. Technical indicators from market data
-            2. Market sentiment and news impact
-            3. Portfolio diversification
-            4. Risk management based on user preferences
-            5. Current market conditions
-            
-            Provide a recommendation in JSON format:
-            {{
-                "decision": "BUY|SELL|HOLD",
-                "confidence": 0.85,
-                "rationale": "Detailed explanation of the decision",
-                "price_target": 150.00,
-                "risk_assessment": "LOW|MEDIUM|HIGH"
-            }}
-            
-            Only recommend BUY/SELL if confidence > 0.7 and the decision aligns with user risk tolerance.
-            """
-            
-            response = await asyncio.to_thread(
-                self.model.generate_content, prompt
+            prompt = _DECISION_PROMPT.format(
+                symbol=symbol,
+                portfolio_data=_to_json(portfolio_data),
+                market_data=_to_json(market_data),
+                sentiment_data=_to_json(sentiment_data),
+                risk_tolerance=user_preferences.risk_tolerance.value,
+                max_trade_amount=user_preferences.max_trade_amount,
+                auto_trading_enabled=user_preferences.auto_trading_enabled
             )
             
-            # Parse AI decision
-            result = json.loads(response.text.strip())
+            response = await self.model.generate_content_async(prompt)
             
-            decision_type_str = result.get('decision', 'HOLD').upper()
-            confidence = float(result.get('confidence', 0.0))
-            rationale = result.get('rationale', 'No rationale provided')
-            price_target = result.get('price_target')
-            risk_assessment = result.get('risk_assessment', 'MEDIUM')
+            # Parse AI decision
+            result = _parse_json_response(response.text, _DecisionPayload)
+            return self._build_decision(symbol, result, portfolio_data, sentiment_data)
             
-            # Validate decision type
-            try:
-                decision_type = DecisionType(decision_type_str)
-            except ValueError:
-                logger.warning(f"Invalid decision type '{decision_type_str}', defaulting to HOLD")
-                decision_type = DecisionType.HOLD
+        except Exception as e:
+            logger.error(f"❌ Gemini trading decision failed: {e}")
+            return await self._fallback_trading_decision(
+                symbol, portfolio_data, market_data, sentiment_data, user_preferences
+            )
+    
+    async def analyze_market_sentiment_batch(
+        self,
+        symbols_data: Dict[str, Tuple[Dict, List[str]]]
+    ) -> Dict[str, Tuple[float, str]]:
+        """
+        Analyze market sentiment for several symbols with a single Gemini call.
+        
+        Args:
+            symbols_data: Mapping of symbol to (market_data, news_summaries)
             
-            # Apply confidence and risk filters
-            confidence_threshold = self.config_manager.get_ai_confidence_threshold()
+        Returns:
+            Mapping of symbol to (sentiment_score, analysis_summary)
+        """
+        if not symbols_data:
+            return {}
+        
+        if not self.model:
+            logger.warning("Gemini model not available, using fallback sentiment analysis")
+            return await self._fallback_sentiment_batch(symbols_data)
+        
+        try:
+            symbol_blocks = '\n'.join(
+                _SENTIMENT_BATCH_ITEM.format(
+                    symbol=symbol,
+                    market_data=_to_json(market_data),
+                    news='\n'.join(news_summaries[:5])
+                )
+                for symbol, (market_data, news_summaries) in symbols_data.items()
+            )
+            prompt = _SENTIMENT_BATCH_PROMPT.format(symbols=symbol_blocks)
             
-            if confidence < confidence_threshold:
-                logger.info(f"Decision confidence {confidence} below threshold {confidence_threshold}")
-                decision_type = DecisionType.HOLD
-                rationale += f" (Confidence below threshold: {confidence})"
+            response = await self.model.generate_content_async(prompt)
+            results = {
+                str(item.get('symbol', '')).upper(): item
+                for item in _parse_json_response(response.text, _SentimentPayload, many=True)
+            }
             
-            # Create AI decision record
-            ai_decision = AIDecision(
-                symbol=symbol,
-                decision_type=decision_type,
-                confidence_score=confidence,
-                rationale=rationale,
-                price_target=Decimal(str(price_target)) if price_target else None
-            )
+            sentiments = {}
+            for symbol, (market_data, news_summaries) in symbols_data.items():
+                item = results.get(symbol.upper())
+                if item is None:
+                    logger.warning(f"Gemini batch response missing {symbol}, using fallback sentiment analysis")
+                    sentiments[symbol] = await self._fallback_sentiment_analysis(
+                        symbol, market_data, news_summaries
+                    )
+                    continue
+                
+                sentiment_score = max(-1.0, min(1.0, float(item.get('sentiment_score', 0.0))))
+                sentiments[symbol] = (sentiment_score, item.get('summary', 'No analysis available'))
             
-            logger.info(f"🤖 AI Decision for {symbol}: {decision_type.value} (confidence: {confidence})")
-            return ai_decision
+            logger.info(f"📊 Batch sentiment analysis for {len(sentiments)} symbols")
+            return sentiments
             
         except Exception as e:
-            logger.error(f"❌ Gemini trading decision failed: {e}")
-            return await self._fallback_trading_decision(
-                symbol, portfolio_data, market_data, sentiment_data, user_preferences
-            )
+            logger.error(f"❌ Gemini batch sentiment analysis failed: {e}")
+            return await self._fallback_sentiment_batch(symbols_data)
+    
+    def _build_decision(
+        self,
+        symbol: str,
+        result: Dict,
+        portfolio_data: Dict,
+        sentiment_data: Dict
+    ) -> AIDecision:
+        """Build an AIDecision from a parsed Gemini recommendation."""
+        decision_type_str = result.get('decision', 'HOLD').upper()
+        confidence = float(result.get('confidence', 0.0))
+        rationale = result.get('rationale', 'No rationale provided')
+        price_target = result.get('price_target')
+        
+        # Validate decision type
+        try:
+            decision_type = DecisionType(decision_type_str)
+        except ValueError:
+            logger.warning(f"Invalid decision type '{decision_type_str}', defaulting to HOLD")
+            decision_type = DecisionType.HOLD
+        
+        # Apply confidence and risk filters
+        confidence_threshold = self.config_manager.get_ai_confidence_threshold()
+        
+        if confidence < confidence_threshold:
+            logger.info(f"Decision confidence {confidence} below threshold {confidence_threshold}")
+            decision_type = DecisionType.HOLD
+            rationale += f" (Confidence below threshold: {confidence})"
+        
+        # Create AI decision record
+        ai_decision = AIDecision(
+            symbol=symbol,
+            decision_type=decision_type,
+            confidence_score=confidence,
+            rationale=rationale,
+            price_target=Decimal(str(price_target)) if price_target else None,
+            **self._decision_snapshot(portfolio_data, sentiment_data)
+        )
+        
+        logger.info(f"🤖 AI Decision for {symbol}: {decision_type.value} (confidence: {confidence})")
+        return ai_decision
+    
+    async def _fallback_sentiment_batch(
+        self,
+        symbols_data: Dict[str, Tuple[Dict, List[str]]]
+    ) -> Dict[str, Tuple[float, str]]:
+        """Run fallback sentiment analysis for each symbol in a batch."""
+        return {
+            symbol: await self._fallback_sentiment_analysis(symbol, market_data, news_summaries)
+            for symbol, (market_data, news_summaries) in symbols_data.items()
+        }
     
     async def _fallback_sentiment_analysis(
         self,
@@ -230,12 +452,7 @@ class AITradingService:
             sentiment_score += change_pct / 100.0  # Convert percentage to decimal
         
         # Basic news sentiment (count positive/negative keywords)
-        positive_words = ['up', 'gain', 'rise', 'bull', 'positive', 'strong', 'growth']
-        negative_words = ['down', 'fall', 'drop', 'bear', 'negative', 'weak', 'decline']
-        
-        news_text = ' '.join(news_summaries).lower()
-        positive_count = sum(1 for word in positive_words if word in news_text)
-        negative_count = sum(1 for word in negative_words if word in news_text)
+        positive_count, negative_count = _count_sentiment_words(' '.join(news_summaries).lower())
         
         if positive_count + negative_count > 0:
             news_sentiment = (positive_count - negative_count) / (positive_count + negative_count)
@@ -288,9 +505,20 @@ class AITradingService:
             symbol=symbol,
             decision_type=decision_type,
             confidence_score=confidence,
-            rationale=rationale
+            rationale=rationale,
+            **self._decision_snapshot(portfolio_data, sentiment_data)
         )
     
+    def _decision_snapshot(self, portfolio_data: Dict, sentiment_data: Dict) -> Dict:
+        """Capture sentiment and portfolio context to store alongside a decision."""
+        sentiment_score = sentiment_data.get('sentiment_score')
+        portfolio_value = portfolio_data.get('total_value')
+        
+        return {
+            'sentiment_score_at_decision': float(sentiment_score) if sentiment_score is not None else None,
+            'portfolio_value_at_decision': Decimal(str(portfolio_value)) if portfolio_value is not None else None
+        }
+    
     async def learn_from_feedback(
         self,
         decision: AIDecision,
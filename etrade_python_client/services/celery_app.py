@@ -5,14 +5,14 @@ import logging
 from celery import Celery
 from celery.schedules import crontab
 
-from ..utils.config_manager import ConfigManager
+from ..utils.config_manager import get_config_manager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize configuration
-config_manager = ConfigManager()
+config_manager = get_config_manager()
 
 # Create Celery app
 celery_app = Celery(
@@ -22,7 +22,7 @@ celery_app = Celery(
     include=['etrade_python_client.services.tasks']
 )
 
-# Celery configuration
+# Celery configuration; async tasks run through tasks.AsyncTask on one event loop per worker process
 celery_app.conf.update(
     task_serializer='json',
     accept_content=['json'],
@@ -83,7 +83,8 @@ celery_app.conf.beat_schedule = {
 
 # Task routes (optional - for task distribution)
 celery_app.conf.task_routes = {
-    'etrade_python_client.services.tasks.backup_database': {'queue': 'maintenance'},
+    # Backups get their own queue, consumed by the single-slot celery_backup_worker, so they run one at a time
+    'etrade_python_client.services.tasks.backup_database': {'queue': 'backup'},
     'etrade_python_client.services.tasks.cleanup_old_data': {'queue': 'maintenance'},
     'etrade_python_client.services.tasks.update_market_sentiment': {'queue': 'market_data'},
     'etrade_python_client.services.tasks.optimize_ai_learning': {'queue': 'ai_processing'},
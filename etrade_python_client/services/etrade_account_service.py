@@ -1,61 +1,152 @@
 """E*TRADE Account Services for portfolio and balance information."""
 
-import json
+import os
+import time
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from decimal import Decimal
 
-from .etrade_auth import ETradeAuth
+import orjson
+
+from .etrade_auth import ETradeAuth, map_in_threads
+from .etrade_base_service import BaseETradeService
+from .etrade_models import ACCOUNT_LIST_DECODER, PORTFOLIO_DECODER, Account, Position
+
+try:
+    from redis import Redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-class ETradeAccountService:
+# Concurrent per-account requests when fanning out across accounts
+_ACCOUNT_FANOUT_LIMIT = 8
+
+# Accounts rarely change, so the list is cached per access token
+_ACCOUNT_LIST_TTL_SECONDS = 600
+_ACCOUNT_LIST_REDIS_PREFIX = "etrade:accounts:"
+
+# API paths, relative to the auth service's base URL
+_PATHS = {
+    "list": "/v1/accounts/list.json",
+    "balance": "/v1/accounts/{}/balance.json",
+    "portfolio": "/v1/accounts/{}/portfolio.json"
+}
+
+# Account statuses excluded from account lists
+_CLOSED_ACCOUNT_STATUSES = frozenset({"CLOSED"})
+
+# ijson path of each position inside a portfolio response
+_POSITION_ITEMS_PREFIX = "PortfolioResponse.AccountPortfolio.item.Position.item"
+
+
+class ETradeAccountService(BaseETradeService):
     """Service for interacting with E*TRADE account APIs."""
     
     def __init__(self, auth_service: ETradeAuth):
-        self.auth_service = auth_service
+        super().__init__(auth_service)
+        # (cache key, expiry on the monotonic clock, accounts)
+        self._account_list_cache: Optional[Tuple[str, float, List[Dict[str, Any]]]] = None
+        
+        redis_url = os.environ.get('REDIS_URL')
+        self._redis = Redis.from_url(redis_url) if REDIS_AVAILABLE and redis_url else None
+    
+    def _account_list_cache_key(self) -> str:
+        """Cache key tied to the current access token, so re-authenticating busts the cache."""
+        token = self._session.access_token
+        return _ACCOUNT_LIST_REDIS_PREFIX + hashlib.sha256(token.encode()).hexdigest()[:16]
+    
+    def _get_cached_account_list(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached account list from memory or Redis, if still fresh."""
+        if self._account_list_cache is not None:
+            key, expires_at, accounts = self._account_list_cache
+            if key == cache_key and time.monotonic() < expires_at:
+                return accounts
+        
+        if self._redis is not None:
+            try:
+                cached = self._redis.get(cache_key)
+                if cached is not None:
+                    accounts = orjson.loads(cached)
+                    ttl = self._redis.ttl(cache_key)
+                    self._account_list_cache = (cache_key, time.monotonic() + max(ttl, 0), accounts)
+                    return accounts
+            except Exception as e:
+                logger.warning(f"⚠️ Account list cache read failed: {e}")
+        return None
+    
+    def _store_account_list(self, cache_key: str, accounts: List[Dict[str, Any]]):
+        """Cache the account list in memory and, when configured, in Redis."""
+        self._account_list_cache = (cache_key, time.monotonic() + _ACCOUNT_LIST_TTL_SECONDS, accounts)
+        if self._redis is not None:
+            try:
+                self._redis.setex(cache_key, _ACCOUNT_LIST_TTL_SECONDS, orjson.dumps(accounts))
+            except Exception as e:
+                logger.warning(f"⚠️ Account list cache write failed: {e}")
+    
+    def invalidate_account_list(self):
+        """Drop the cached account list so the next call refetches it."""
+        if self._account_list_cache is not None and self._redis is not None:
+            try:
+                self._redis.delete(self._account_list_cache[0])
+            except Exception as e:
+                logger.warning(f"⚠️ Account list cache invalidation failed: {e}")
+        self._account_list_cache = None
     
     def get_account_list(self) -> List[Dict[str, Any]]:
         """
-        Retrieve list of E*TRADE accounts.
+        Retrieve list of E*TRADE accounts, cached for a few minutes.
         
         Returns:
             List of account dictionaries
         """
-        if not self.auth_service.is_authenticated():
-            raise ValueError("Not authenticated with E*TRADE. Complete OAuth flow first.")
+        self._require_auth()
+        
+        cache_key = self._account_list_cache_key()
+        accounts = self._get_cached_account_list(cache_key)
+        if accounts is not None:
+            return accounts
+        
+        data = self._call(
+            "GET", _PATHS["list"],
+            response_key="AccountListResponse", action="get account list"
+        )
+        if "Accounts" not in data or "Account" not in data["Accounts"]:
+            raise Exception("Failed to retrieve account list from E*TRADE API")
         
+        # Filter out closed accounts; accountStatus is documented as always present
+        account_entries = data["Accounts"]["Account"]
         try:
-            session = self.auth_service.get_session()
-            base_url = self.auth_service.get_base_url()
-            
-            # URL for the API endpoint
-            url = f"{base_url}/v1/accounts/list.json"
-            
-            # Make API call for GET request
-            response = session.get(url, header_auth=True)
-            logger.debug("Request Header: %s", response.request.headers)
-            
-            # Handle and parse response
-            if response is not None and response.status_code == 200:
-                parsed = json.loads(response.text)
-                logger.debug("Response Body: %s", json.dumps(parsed, indent=4, sort_keys=True))
-                
-                data = response.json()
-                if data is not None and "AccountListResponse" in data and "Accounts" in data["AccountListResponse"] \
-                        and "Account" in data["AccountListResponse"]["Accounts"]:
-                    accounts = data["AccountListResponse"]["Accounts"]["Account"]
-                    # Filter out closed accounts
-                    accounts = [d for d in accounts if d.get('accountStatus') != 'CLOSED']
-                    return accounts
-                else:
-                    raise Exception("Failed to retrieve account list from E*TRADE API")
-            else:
-                raise Exception(f"E*TRADE API request failed with status code: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"Failed to get account list: {e}")
-            raise
+            accounts = [a for a in account_entries if a["accountStatus"] not in _CLOSED_ACCOUNT_STATUSES]
+        except KeyError:
+            logger.warning("⚠️ E*TRADE account entry without accountStatus, treating it as open")
+            accounts = [a for a in account_entries if a.get("accountStatus") not in _CLOSED_ACCOUNT_STATUSES]
+        self._store_account_list(cache_key, accounts)
+        return accounts
+    
+    def get_accounts(self) -> List[Account]:
+        """
+        Retrieve open E*TRADE accounts decoded straight into typed structs.
+        
+        Returns:
+            List of Account structs
+        """
+        envelope = self._call(
+            "GET", _PATHS["list"],
+            decode=ACCOUNT_LIST_DECODER.decode, action="get account list"
+        )
+        return [
+            account for account in envelope.account_list_response.accounts.account
+            if account.account_status not in _CLOSED_ACCOUNT_STATUSES
+        ]
     
     def get_account_balance(self, account_id_key: str) -> Dict[str, Any]:
         """
@@ -67,44 +158,24 @@ class ETradeAccountService:
         Returns:
             Dictionary containing balance information
         """
-        if not self.auth_service.is_authenticated():
-            raise ValueError("Not authenticated with E*TRADE. Complete OAuth flow first.")
+        return self._call(
+            "GET", _PATHS["balance"], account_id_key,
+            params={"instType": "BROKERAGE", "realTimeNAV": "true"},
+            response_key="BalanceResponse", action="get account balance"
+        )
+    
+    def get_balances(self, account_id_keys: List[str], max_workers: int = _ACCOUNT_FANOUT_LIMIT) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve balances for several accounts concurrently on a thread pool.
         
-        try:
-            session = self.auth_service.get_session()
-            base_url = self.auth_service.get_base_url()
-            
-            # URL for the API endpoint
-            url = f"{base_url}/v1/accounts/{account_id_key}/balance.json"
-            
-            # Add parameters and header information
-            from ..utils.config_manager import ConfigManager
-            config_manager = ConfigManager()
-            
-            params = {"instType": "BROKERAGE", "realTimeNAV": "true"}
-            headers = {"consumerkey": config_manager.get_consumer_key()}
-            
-            # Make API call for GET request
-            response = session.get(url, header_auth=True, params=params, headers=headers)
-            logger.debug("Request url: %s", url)
-            logger.debug("Request Header: %s", response.request.headers)
+        Args:
+            account_id_keys: accountIdKeys to fetch
+            max_workers: Maximum concurrent requests
             
-            # Handle and parse response
-            if response is not None and response.status_code == 200:
-                parsed = json.loads(response.text)
-                logger.debug("Response Body: %s", json.dumps(parsed, indent=4, sort_keys=True))
-                data = response.json()
-                
-                if data is not None and "BalanceResponse" in data:
-                    return data["BalanceResponse"]
-                else:
-                    raise Exception("Failed to retrieve balance information from E*TRADE API")
-            else:
-                raise Exception(f"E*TRADE API request failed with status code: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"Failed to get account balance: {e}")
-            raise
+        Returns:
+            Balance information keyed by accountIdKey
+        """
+        return map_in_threads(self.get_account_balance, account_id_keys, max_workers)
     
     def get_portfolio(self, account_id_key: str) -> Dict[str, Any]:
         """
@@ -116,36 +187,133 @@ class ETradeAccountService:
         Returns:
             Dictionary containing portfolio information
         """
-        if not self.auth_service.is_authenticated():
-            raise ValueError("Not authenticated with E*TRADE. Complete OAuth flow first.")
+        return self._call(
+            "GET", _PATHS["portfolio"], account_id_key,
+            response_key="PortfolioResponse", accept_204=True, action="get portfolio"
+        )
+    
+    def get_positions(self, account_id_key: str) -> List[Position]:
+        """
+        Retrieve portfolio positions decoded straight into typed structs.
         
-        try:
-            session = self.auth_service.get_session()
-            base_url = self.auth_service.get_base_url()
-            
-            # URL for the API endpoint
-            url = f"{base_url}/v1/accounts/{account_id_key}/portfolio.json"
+        Args:
+            account_id_key: The accountIdKey for the account
             
-            # Make API call for GET request
-            response = session.get(url, header_auth=True)
-            logger.debug("Request Header: %s", response.request.headers)
+        Returns:
+            List of Position structs across the account's portfolios
+        """
+        envelope = self._call(
+            "GET", _PATHS["portfolio"], account_id_key,
+            accept_204=True, decode=PORTFOLIO_DECODER.decode, action="get portfolio"
+        )
+        if not envelope:
+            # No content - empty portfolio
+            return []
+        return [
+            position
+            for account_portfolio in envelope.portfolio_response.account_portfolio
+            for position in account_portfolio.position
+        ]
+    
+    def iter_positions(self, account_id_key: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream portfolio positions for an account one at a time.
+        
+        Positions are parsed incrementally as the response arrives, so memory stays
+        bounded by a single position. Falls back to get_portfolio without ijson.
+        
+        Args:
+            account_id_key: The accountIdKey for the account
             
-            # Handle and parse response
-            if response is not None and response.status_code == 200:
-                parsed = json.loads(response.text)
-                logger.debug("Response Body: %s", json.dumps(parsed, indent=4, sort_keys=True))
-                data = response.json()
-                
-                if data is not None and "PortfolioResponse" in data:
-                    return data["PortfolioResponse"]
-                else:
-                    raise Exception("Failed to retrieve portfolio information from E*TRADE API")
-            elif response is not None and response.status_code == 204:
+        Yields:
+            Position dictionaries
+        """
+        if not IJSON_AVAILABLE:
+            for account_portfolio in self.get_portfolio(account_id_key).get("AccountPortfolio", []):
+                yield from account_portfolio.get("Position", [])
+            return
+        
+        self._require_auth()
+        url = _PATHS["portfolio"].format(account_id_key)
+        with self.auth_service.get_http().stream("GET", url) as response:
+            if response.status_code == 204:
                 # No content - empty portfolio
-                return {}
-            else:
+                return
+            if response.status_code != 200:
                 raise Exception(f"E*TRADE API request failed with status code: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"Failed to get portfolio: {e}")
-            raise
\ No newline at end of file
+            
+            positions = ijson.sendable_list()
+            parser = ijson.items_coro(positions, _POSITION_ITEMS_PREFIX, use_float=True)
+            for chunk in response.iter_bytes():
+                parser.send(chunk)
+                yield from positions
+                del positions[:]
+            parser.close()
+            yield from positions
+    
+    def get_portfolios(self, account_id_keys: List[str], max_workers: int = _ACCOUNT_FANOUT_LIMIT) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve portfolios for several accounts concurrently on a thread pool.
+        
+        Args:
+            account_id_keys: accountIdKeys to fetch
+            max_workers: Maximum concurrent requests
+            
+        Returns:
+            Portfolio information keyed by accountIdKey
+        """
+        return map_in_threads(self.get_portfolio, account_id_keys, max_workers)
+    
+    async def aget_account_balance(self, account_id_key: str) -> Dict[str, Any]:
+        """
+        Retrieve account balance information without blocking the event loop.
+        
+        Args:
+            account_id_key: The accountIdKey for the account
+            
+        Returns:
+            Dictionary containing balance information
+        """
+        return await self._acall(
+            "GET", _PATHS["balance"], account_id_key,
+            params={"instType": "BROKERAGE", "realTimeNAV": "true"},
+            response_key="BalanceResponse", action="get account balance"
+        )
+    
+    async def aget_portfolio(self, account_id_key: str) -> Dict[str, Any]:
+        """
+        Retrieve portfolio positions for an account without blocking the event loop.
+        
+        Args:
+            account_id_key: The accountIdKey for the account
+            
+        Returns:
+            Dictionary containing portfolio information
+        """
+        return await self._acall(
+            "GET", _PATHS["portfolio"], account_id_key,
+            response_key="PortfolioResponse", accept_204=True, action="get portfolio"
+        )
+    
+    async def aget_positions(self, account_id_key: str) -> List[Position]:
+        """
+        Retrieve typed portfolio positions without blocking the event loop.
+        
+        Args:
+            account_id_key: The accountIdKey for the account
+            
+        Returns:
+            List of Position structs across the account's portfolios
+        """
+        envelope = await self._acall(
+            "GET", _PATHS["portfolio"], account_id_key,
+            accept_204=True, decode=PORTFOLIO_DECODER.decode, action="get portfolio"
+        )
+        if not envelope:
+            # No content - empty portfolio
+            return []
+        return [
+            position
+            for account_portfolio in envelope.portfolio_response.account_portfolio
+            for position in account_portfolio.position
+        ]
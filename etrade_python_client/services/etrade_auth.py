@@ -1,23 +1,137 @@
 """E*TRADE OAuth 1.0a Authentication Service."""
 
 import os
-import json
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Generator, List, Set
+
+import httpx
+import orjson
 from rauth import OAuth1Service
-from ..utils.config_manager import ConfigManager
+from rauth.session import OAuth1Auth
+from ..utils.config_manager import get_config_manager
+from ..utils.logging_utils import LazyJson
 
 logger = logging.getLogger(__name__)
 
+# All API traffic goes to a single E*TRADE host, so this is effectively a per-host cap
+_MAX_ASYNC_CONNECTIONS = 8
+_HTTP_TIMEOUT_SECONDS = 30.0
+
+# OAuth endpoints per environment; authorization always happens on us.etrade.com
+_ETRADE_PROD_URLS = {
+    "request_token_url": "https://api.etrade.com/oauth/request_token",
+    "access_token_url": "https://api.etrade.com/oauth/access_token",
+    "authorize_url": "https://us.etrade.com/e/t/etws/authorize?key={}&token={}",
+    "base_url": "https://api.etrade.com"
+}
+_ETRADE_SANDBOX_URLS = {
+    "request_token_url": "https://apisb.etrade.com/oauth/request_token",
+    "access_token_url": "https://apisb.etrade.com/oauth/access_token",
+    "authorize_url": "https://us.etrade.com/e/t/etws/authorize?key={}&token={}",
+    "base_url": "https://apisb.etrade.com"
+}
+
+
+def parse_response(response) -> Any:
+    """Decode an E*TRADE JSON response body once; the body is only pretty-printed if DEBUG is emitted."""
+    data = orjson.loads(response.content)
+    logger.debug("Response Body: %s", LazyJson(data))
+    return data
+
+
+def map_in_threads(func: Callable[[str], Any], keys: List[str], max_workers: int) -> Dict[str, Any]:
+    """Call a blocking API method for each key on a thread pool and return results keyed by input."""
+    if not keys:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        futures = {key: executor.submit(func, key) for key in keys}
+        return {key: future.result() for key, future in futures.items()}
+
+
+class _OAuth1Signer(httpx.Auth):
+    """httpx auth hook that signs each request with the current E*TRADE access token."""
+    
+    def __init__(self, auth_service: "ETradeAuth"):
+        self.auth_service = auth_service
+    
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        request.headers["Authorization"] = self.auth_service.get_auth_header(
+            request.method,
+            str(request.url.copy_with(query=None)),
+            dict(request.url.params)
+        )
+        yield request
+
+
 class ETradeAuth:
     """E*TRADE OAuth 1.0a Authentication Service."""
     
     def __init__(self):
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config_manager()
         self.session = None
         self.base_url = None
         self.account_id_key = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing_clients: Set[asyncio.Task] = set()
+        self._http: Optional[httpx.Client] = None
+        self._http_lock = threading.Lock()
+        self._oauth_services: Dict[bool, OAuth1Service] = {}
+        # Bound-method listeners are held weakly so services built per call do not stay alive
+        self._listeners: List[Callable[[], Optional[Callable[[Any, Optional[str]], None]]]] = []
+    
+    def add_auth_listener(self, listener: Callable[[Any, Optional[str]], None]):
+        """
+        Register a callback invoked with (session, base_url) whenever authentication changes.
         
+        The listener is called immediately with the current state. Bound methods are held
+        weakly and dropped once their instance is garbage collected.
+        
+        Args:
+            listener: Callback receiving the session and base URL
+        """
+        if hasattr(listener, '__self__'):
+            self._listeners.append(weakref.WeakMethod(listener))
+        else:
+            self._listeners.append(lambda: listener)
+        listener(self.session, self.base_url)
+    
+    def remove_auth_listener(self, listener: Callable[[Any, Optional[str]], None]):
+        """
+        Unregister a callback added with add_auth_listener.
+        
+        Args:
+            listener: Callback to remove
+        """
+        self._listeners = [ref for ref in self._listeners if ref() not in (None, listener)]
+    
+    def _notify_listeners(self):
+        """Push the current session and base URL to registered listeners."""
+        live = []
+        for ref in self._listeners:
+            listener = ref()
+            if listener is not None:
+                live.append(ref)
+                listener(self.session, self.base_url)
+        self._listeners = live
+    
+    def _get_oauth_service(self, use_sandbox: bool) -> OAuth1Service:
+        """Get the OAuth service for an environment, building it on first use."""
+        etrade = self._oauth_services.get(use_sandbox)
+        if etrade is None:
+            etrade = OAuth1Service(
+                name="etrade",
+                consumer_key=self.config_manager.get_consumer_key(),
+                consumer_secret=self.config_manager.get_consumer_secret(),
+                **(_ETRADE_SANDBOX_URLS if use_sandbox else _ETRADE_PROD_URLS)
+            )
+            self._oauth_services[use_sandbox] = etrade
+        return etrade
+    
     def initiate_oauth(self, use_sandbox: bool = True) -> str:
         """
         Initiate OAuth 1.0a flow and return authorization URL.
@@ -29,23 +143,9 @@ class ETradeAuth:
             Authorization URL for user to visit
         """
         try:
-            # Configure OAuth service
-            etrade = OAuth1Service(
-                name="etrade",
-                consumer_key=self.config_manager.get_consumer_key(),
-                consumer_secret=self.config_manager.get_consumer_secret(),
-                request_token_url="https://api.etrade.com/oauth/request_token",
-                access_token_url="https://api.etrade.com/oauth/access_token",
-                authorize_url="https://us.etrade.com/e/t/etws/authorize?key={}&token={}",
-                base_url="https://api.etrade.com"
-            )
-            
-            # Update URLs for sandbox if needed
+            etrade = self._get_oauth_service(use_sandbox)
             if use_sandbox:
                 self.base_url = self.config_manager.get_sandbox_base_url()
-                etrade.request_token_url = "https://apisb.etrade.com/oauth/request_token"
-                etrade.access_token_url = "https://apisb.etrade.com/oauth/access_token"
-                etrade.authorize_url = "https://us.etrade.com/e/t/etws/authorize?key={}&token={}"
             else:
                 self.base_url = self.config_manager.get_prod_base_url()
             
@@ -86,6 +186,7 @@ class ETradeAuth:
                 self.request_token_secret,
                 params={"oauth_verifier": verification_code}
             )
+            self._notify_listeners()
             
             logger.info("OAuth authentication completed successfully")
             return True
@@ -106,6 +207,95 @@ class ETradeAuth:
         """Get the base URL for API calls."""
         return self.base_url
     
+    def _client_options(self) -> Dict[str, Any]:
+        """Shared options for the sync and async HTTP clients."""
+        return {
+            "http2": True,
+            "base_url": self.base_url,
+            "auth": _OAuth1Signer(self),
+            "headers": {"consumerkey": self.config_manager.get_consumer_key()},
+            "timeout": _HTTP_TIMEOUT_SECONDS
+        }
+    
+    def get_http(self) -> httpx.Client:
+        """Get the shared keep-alive HTTP/2 client for API calls (thread-safe)."""
+        with self._http_lock:
+            if self._http is None or self._http.base_url != httpx.URL(self.base_url):
+                if self._http is not None:
+                    self._http.close()
+                self._http = httpx.Client(**self._client_options())
+            return self._http
+    
+    def get_async_client(self) -> httpx.AsyncClient:
+        """Get the shared async HTTP/2 client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop \
+                or self._async_client.base_url != httpx.URL(self.base_url):
+            self._retire_async_client(loop)
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=_MAX_ASYNC_CONNECTIONS),
+                **self._client_options()
+            )
+            self._async_client_loop = loop
+        return self._async_client
+    
+    def _retire_async_client(self, running_loop: asyncio.AbstractEventLoop):
+        """Close the replaced async client on the loop that owns it, if that loop can still run it."""
+        client, owner_loop = self._async_client, self._async_client_loop
+        self._async_client = None
+        self._async_client_loop = None
+        # A client from another (closed or idle) loop cannot be awaited here; its sockets are
+        # released when it is collected
+        if client is None or owner_loop is not running_loop:
+            return
+        
+        # Hold a reference until the close finishes so the task is not garbage collected mid-close
+        closing = running_loop.create_task(client.aclose())
+        self._closing_clients.add(closing)
+        closing.add_done_callback(self._closing_clients.discard)
+    
+    def get_auth_header(self, method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a signed OAuth 1.0a Authorization header for a request sent outside the rauth session.
+        
+        Args:
+            method: HTTP method
+            url: Full request URL without query string
+            params: Query parameters included in the signature
+            
+        Returns:
+            Authorization header value
+        """
+        req_kwargs = {"params": dict(params or {}), "headers": {}}
+        oauth_params = self.session._get_oauth_params(req_kwargs)
+        oauth_params["oauth_signature"] = self.session.signature.sign(
+            self.session.consumer_secret,
+            self.session.access_token_secret,
+            method,
+            url,
+            oauth_params,
+            req_kwargs
+        )
+        return OAuth1Auth(oauth_params)._get_auth_header()
+    
+    def close(self):
+        """Close the shared sync HTTP client."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+    
+    async def aclose(self):
+        """Close the shared async HTTP client."""
+        loop = asyncio.get_running_loop()
+        closing = [task for task in self._closing_clients if task.get_loop() is loop]
+        if closing:
+            await asyncio.gather(*closing, return_exceptions=True)
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+    
     def save_credentials(self, filepath: str = "etrade_credentials.json"):
         """
         Save OAuth credentials to a file for future use.
@@ -122,8 +312,15 @@ class ETradeAuth:
             "access_token_secret": self.session.access_token_secret
         }
         
-        with open(filepath, "w") as f:
-            json.dump(credentials, f)
+        # Write a private temp file and atomically swap it in, so a crash never leaves a truncated file
+        tmp_path = f"{filepath}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, orjson.dumps(credentials))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, filepath)
         
         logger.info(f"Credentials saved to {filepath}")
     
@@ -137,25 +334,11 @@ class ETradeAuth:
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Credentials file not found: {filepath}")
         
-        with open(filepath, "r") as f:
-            credentials = json.load(f)
-        
-        # Configure OAuth service
-        etrade = OAuth1Service(
-            name="etrade",
-            consumer_key=self.config_manager.get_consumer_key(),
-            consumer_secret=self.config_manager.get_consumer_secret(),
-            request_token_url="https://api.etrade.com/oauth/request_token",
-            access_token_url="https://api.etrade.com/oauth/access_token",
-            authorize_url="https://us.etrade.com/e/t/etws/authorize?key={}&token={}",
-            base_url="https://api.etrade.com"
-        )
+        with open(filepath, "rb") as f:
+            credentials = orjson.loads(f.read())
         
-        # Update URLs for sandbox if needed
         self.base_url = credentials["base_url"]
-        if "sandbox" in self.base_url:
-            etrade.request_token_url = "https://apisb.etrade.com/oauth/request_token"
-            etrade.access_token_url = "https://apisb.etrade.com/oauth/access_token"
+        etrade = self._get_oauth_service(self.base_url == self.config_manager.get_sandbox_base_url())
         
         # Recreate session
         self.session = etrade.get_session(
@@ -163,5 +346,6 @@ class ETradeAuth:
         )
         
         self.etrade_service = etrade
+        self._notify_listeners()
         
         logger.info(f"Credentials loaded from {filepath}")
\ No newline at end of file
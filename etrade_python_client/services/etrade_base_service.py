@@ -0,0 +1,210 @@
+"""Shared request plumbing for E*TRADE API services."""
+
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from .etrade_auth import ETradeAuth, parse_response
+
+logger = logging.getLogger(__name__)
+
+# Order endpoints take XML request bodies
+_XML_HEADERS = {"Content-Type": "application/xml"}
+
+# Transient failures are retried with jittered exponential backoff
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_MAX_ATTEMPTS = 5
+_BACKOFF_INITIAL_SECONDS = 0.5
+_BACKOFF_MAX_SECONDS = 8.0
+
+# Bodies above this size are decoded off the event loop thread
+_ASYNC_DECODE_OFFLOAD_BYTES = 64 * 1024
+
+
+class BaseETradeService:
+    """Base class for E*TRADE API services with a single request/response path."""
+    
+    def __init__(self, auth_service: ETradeAuth):
+        self.auth_service = auth_service
+        self._session = None
+        self._base_url: Optional[str] = None
+        auth_service.add_auth_listener(self._on_auth_changed)
+    
+    def _on_auth_changed(self, session, base_url: Optional[str]):
+        """Snapshot the auth state so request paths skip the auth service lookups."""
+        self._session = session
+        self._base_url = base_url
+    
+    def _require_auth(self):
+        """Raise if the OAuth flow has not been completed."""
+        if self._session is None:
+            raise ValueError("Not authenticated with E*TRADE. Complete OAuth flow first.")
+    
+    def _call(
+        self,
+        method: str,
+        path_fmt: str,
+        *path_args: Any,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[str] = None,
+        response_key: Optional[str] = None,
+        accept_204: bool = False,
+        decode: Optional[Callable[[bytes], Any]] = None,
+        action: str = "call E*TRADE API"
+    ) -> Any:
+        """
+        Send an API request and return the parsed response body.
+        
+        Args:
+            method: HTTP method
+            path_fmt: API path with {} placeholders for path_args
+            path_args: Values formatted into the path
+            params: Query parameters
+            content: XML request body
+            response_key: Top-level key to return from the response
+            accept_204: Return {} for 204 No Content instead of failing
+            decode: Typed decoder for the raw body, used instead of orjson
+            action: Description used in the error log
+        
+        Returns:
+            Parsed response, or its response_key subtree
+        """
+        self._require_auth()
+        
+        try:
+            url = path_fmt.format(*path_args)
+            http = self.auth_service.get_http()
+            
+            for attempt in range(1, _MAX_ATTEMPTS + 1):
+                try:
+                    response = http.request(
+                        method, url, params=params, content=content,
+                        headers=_XML_HEADERS if content is not None else None
+                    )
+                except httpx.TransportError:
+                    if method != "GET" or attempt == _MAX_ATTEMPTS:
+                        raise
+                    response = None
+                
+                delay = self._retry_delay(method, response, attempt)
+                if delay is None:
+                    break
+                time.sleep(delay)
+            
+            self._log_request(response, content)
+            return self._handle_response(response, response_key, accept_204, decode)
+        
+        except Exception as e:
+            logger.error(f"Failed to {action}: {e}")
+            raise
+    
+    async def _acall(
+        self,
+        method: str,
+        path_fmt: str,
+        *path_args: Any,
+        params: Optional[Dict[str, Any]] = None,
+        response_key: Optional[str] = None,
+        accept_204: bool = False,
+        decode: Optional[Callable[[bytes], Any]] = None,
+        action: str = "call E*TRADE API"
+    ) -> Any:
+        """Async counterpart of _call on the shared async client."""
+        self._require_auth()
+        
+        try:
+            url = path_fmt.format(*path_args)
+            client = self.auth_service.get_async_client()
+            
+            for attempt in range(1, _MAX_ATTEMPTS + 1):
+                try:
+                    response = await client.request(method, url, params=params)
+                except httpx.TransportError:
+                    if method != "GET" or attempt == _MAX_ATTEMPTS:
+                        raise
+                    response = None
+                
+                delay = self._retry_delay(method, response, attempt)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+            
+            self._log_request(response)
+            
+            # Large portfolio payloads would stall other in-flight requests while decoding
+            if len(response.content) > _ASYNC_DECODE_OFFLOAD_BYTES:
+                return await asyncio.to_thread(self._handle_response, response, response_key, accept_204, decode)
+            return self._handle_response(response, response_key, accept_204, decode)
+        
+        except Exception as e:
+            logger.error(f"Failed to {action}: {e}")
+            raise
+    
+    @staticmethod
+    def _retry_delay(method: str, response: Optional[httpx.Response], attempt: int) -> Optional[float]:
+        """
+        Decide whether a request should be retried and how long to wait first.
+        
+        Only GETs are retried on 5xx/connection errors; order POST/PUTs are retried
+        only on 429, where the request was rejected before being processed.
+        
+        Args:
+            method: HTTP method
+            response: Response received, or None after a connection error
+            attempt: Attempt number that just finished, starting at 1
+            
+        Returns:
+            Seconds to sleep before retrying, or None to stop
+        """
+        if attempt >= _MAX_ATTEMPTS:
+            return None
+        if response is not None:
+            if response.status_code not in _RETRYABLE_STATUS_CODES:
+                return None
+            if response.status_code != 429 and method != "GET":
+                return None
+        
+        delay = min(_BACKOFF_MAX_SECONDS, _BACKOFF_INITIAL_SECONDS * 2 ** (attempt - 1))
+        delay += random.uniform(0, _BACKOFF_INITIAL_SECONDS)
+        if response is not None and response.status_code == 429:
+            try:
+                delay = max(delay, float(response.headers.get("Retry-After", 0)))
+            except ValueError:
+                pass
+        
+        status = response.status_code if response is not None else "connection error"
+        logger.warning(f"⚠️ E*TRADE API {method} returned {status}, retrying in {delay:.1f}s")
+        return delay
+    
+    @staticmethod
+    def _log_request(response: httpx.Response, content: Optional[str] = None):
+        """Log the outgoing request when DEBUG is enabled."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request url: %s", response.request.url)
+            logger.debug("Request Header: %s", response.request.headers)
+            if content is not None:
+                logger.debug("Request payload: %s", content)
+    
+    @staticmethod
+    def _handle_response(
+        response: httpx.Response,
+        response_key: Optional[str],
+        accept_204: bool,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> Any:
+        """Check the status code and extract the parsed body."""
+        if response.status_code == 200:
+            data = decode(response.content) if decode is not None else parse_response(response)
+            if response_key is None:
+                return data
+            if data is not None and response_key in data:
+                return data[response_key]
+            raise Exception(f"E*TRADE API response is missing {response_key}")
+        elif response.status_code == 204 and accept_204:
+            # No content - e.g. empty portfolio or no orders
+            return {}
+        raise Exception(f"E*TRADE API request failed with status code: {response.status_code}")
@@ -0,0 +1,76 @@
+"""Typed msgspec structs for E*TRADE API responses."""
+
+from typing import List, Optional
+
+import msgspec
+
+
+class Account(msgspec.Struct, rename="camel"):
+    """Account entry from the account list API."""
+    account_id: str
+    account_id_key: str
+    account_status: str = ""
+    account_name: str = ""
+    account_desc: str = ""
+    account_type: str = ""
+    account_mode: str = ""
+    institution_type: str = ""
+
+
+class AccountList(msgspec.Struct, rename="pascal"):
+    """Accounts container in an account list response."""
+    account: List[Account] = msgspec.field(default_factory=list)
+
+
+class AccountListResponse(msgspec.Struct, rename="pascal"):
+    """Body of an account list response."""
+    accounts: AccountList = msgspec.field(default_factory=AccountList)
+
+
+class AccountListEnvelope(msgspec.Struct, rename="pascal"):
+    """Top-level account list response."""
+    account_list_response: AccountListResponse
+
+
+class Quick(msgspec.Struct, rename="camel"):
+    """Quick quote attached to a position."""
+    last_trade: float = 0.0
+
+
+class Position(
+    msgspec.Struct,
+    rename={
+        "symbol_description": "symbolDescription",
+        "price_paid": "pricePaid",
+        "market_value": "marketValue",
+        "total_gain": "totalGain",
+        "quick": "Quick"
+    }
+):
+    """Portfolio position."""
+    symbol_description: str = ""
+    quantity: float = 0.0
+    price_paid: float = 0.0
+    market_value: float = 0.0
+    total_gain: float = 0.0
+    quick: Optional[Quick] = None
+
+
+class AccountPortfolio(msgspec.Struct, rename="pascal"):
+    """Positions held in one account."""
+    position: List[Position] = msgspec.field(default_factory=list)
+
+
+class PortfolioResponse(msgspec.Struct, rename="pascal"):
+    """Body of a portfolio response."""
+    account_portfolio: List[AccountPortfolio] = msgspec.field(default_factory=list)
+
+
+class PortfolioEnvelope(msgspec.Struct, rename="pascal"):
+    """Top-level portfolio response."""
+    portfolio_response: PortfolioResponse
+
+
+# Reusable decoders parse response bytes straight into structs
+ACCOUNT_LIST_DECODER = msgspec.json.Decoder(AccountListEnvelope)
+PORTFOLIO_DECODER = msgspec.json.Decoder(PortfolioEnvelope)
@@ -1,21 +1,118 @@
 """E*TRADE Order Services for trade execution."""
 
-import json
+import itertools
 import logging
-import random
-from typing import Dict, List, Any, Optional
+import os
+import secrets
+import time
+from string import Template
+from typing import Dict, Iterator, List, Any, Optional
 from decimal import Decimal
+from xml.sax.saxutils import escape
 
-from .etrade_auth import ETradeAuth
+from .etrade_auth import map_in_threads
+from .etrade_base_service import BaseETradeService
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as etree
+    LXML_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-class ETradeOrderService:
+# Concurrent per-account requests when fanning out across accounts
+_ACCOUNT_FANOUT_LIMIT = 8
+
+# API paths, relative to the auth service's base URL
+_PATHS = {
+    "preview": "/v1/accounts/{}/orders/preview.json",
+    "preview_xml": "/v1/accounts/{}/orders/preview",
+    "place": "/v1/accounts/{}/orders/place.json",
+    "list": "/v1/accounts/{}/orders.json",
+    "cancel": "/v1/accounts/{}/orders/cancel.json"
+}
+
+# Client order IDs are at most 20 digits: a random 4-digit per-process prefix, then a
+# 16-digit microsecond start time that advances by 1 per order. The prefix keeps processes
+# started together (web, workers, prefork children) apart; the start time covers restarts.
+_CLIENT_ORDER_ID_PREFIX_DIGITS = 4
+_CLIENT_ORDER_ID_COUNTER_DIGITS = 16
+
+
+def _new_client_order_ids() -> Iterator[int]:
+    """Start a clientOrderId sequence with a fresh per-process prefix."""
+    low = 10 ** (_CLIENT_ORDER_ID_PREFIX_DIGITS - 1)
+    prefix = low + secrets.randbelow(10 ** _CLIENT_ORDER_ID_PREFIX_DIGITS - low)
+    return itertools.count(prefix * 10 ** _CLIENT_ORDER_ID_COUNTER_DIGITS + time.time_ns() // 1000)
+
+
+def _reset_client_order_ids():
+    """Give a forked child its own sequence instead of continuing the parent's copy."""
+    global _client_order_ids
+    _client_order_ids = _new_client_order_ids()
+
+
+_client_order_ids = _new_client_order_ids()
+os.register_at_fork(after_in_child=_reset_client_order_ids)
+
+# Compact XML request bodies; every substituted field is escaped by the caller
+_ORDER_XML = Template(
+    "<Order>"
+    "<allOrNone>false</allOrNone>"
+    "<priceType>$price_type</priceType>"
+    "<orderTerm>$order_term</orderTerm>"
+    "<marketSession>REGULAR</marketSession>"
+    "<stopPrice></stopPrice>"
+    "<limitPrice>$limit_price</limitPrice>"
+    "<Instrument>"
+    "<Product><securityType>EQ</securityType><symbol>$symbol</symbol></Product>"
+    "<orderAction>$order_action</orderAction>"
+    "<quantityType>QUANTITY</quantityType>"
+    "<quantity>$quantity</quantity>"
+    "</Instrument>"
+    "</Order>"
+)
+_PREVIEW_ORDER_XML = Template(
+    "<PreviewOrderRequest>"
+    "<orderType>EQ</orderType>"
+    "<clientOrderId>$client_order_id</clientOrderId>"
+    "$order"
+    "</PreviewOrderRequest>"
+)
+_PLACE_ORDER_XML = Template(
+    "<PlaceOrderRequest>"
+    "<previewIds><previewId>$preview_id</previewId></previewIds>"
+    "<orderType>EQ</orderType>"
+    "$order"
+    "</PlaceOrderRequest>"
+)
+_CANCEL_ORDER_XML = Template("<CancelOrderRequest><orderId>$order_id</orderId></CancelOrderRequest>")
+
+
+def _order_xml(
+    symbol: str,
+    order_action: str,
+    quantity: int,
+    price_type: str,
+    order_term: str,
+    limit_price: Optional[float]
+) -> str:
+    """Render the shared <Order> element of preview and place requests."""
+    return _ORDER_XML.substitute(
+        price_type=escape(price_type),
+        order_term=escape(order_term),
+        limit_price=escape(str(limit_price)) if limit_price else "",
+        symbol=escape(symbol),
+        order_action=escape(order_action),
+        quantity=escape(str(quantity))
+    )
+
+
+class ETradeOrderService(BaseETradeService):
     """Service for interacting with E*TRADE order APIs."""
     
-    def __init__(self, auth_service: ETradeAuth):
-        self.auth_service = auth_service
-    
     def preview_equity_order(
         self, 
         account_id_key: str,
@@ -41,69 +138,38 @@ class ETradeOrderService:
         Returns:
             Dictionary containing preview information
         """
-        if not self.auth_service.is_authenticated():
-            raise ValueError("Not authenticated with E*TRADE. Complete OAuth flow first.")
-        
-        try:
-            session = self.auth_service.get_session()
-            base_url = self.auth_service.get_base_url()
-            
-            # URL for the API endpoint
-            url = f"{base_url}/v1/accounts/{account_id_key}/orders/preview.json"
-            
-            # Add parameters and header information
-            from ..utils.config_manager import ConfigManager
-            config_manager = ConfigManager()
-            
-            headers = {"Content-Type": "application/xml", "consumerKey": config_manager.get_consumer_key()}
-            
-            # Generate client order ID
-            client_order_id = str(random.randint(1000000000, 9999999999))
-            
-            # Create XML payload
-            payload = f"""<PreviewOrderRequest>
-                <orderType>EQ</orderType>
-                <clientOrderId>{client_order_id}</clientOrderId>
-                <Order>
-                    <allOrNone>false</allOrNone>
-                    <priceType>{price_type}</priceType>
-                    <orderTerm>{order_term}</orderTerm>
-                    <marketSession>REGULAR</marketSession>
-                    <stopPrice></stopPrice>
-                    <limitPrice>{limit_price if limit_price else ""}</limitPrice>
-                    <Instrument>
-                        <Product>
-                            <securityType>EQ</securityType>
-                            <symbol>{symbol}</symbol>
-                        </Product>
-                        <orderAction>{order_action}</orderAction>
-                        <quantityType>QUANTITY</quantityType>
-                        <quantity>{quantity}</quantity>
-                    </Instrument>
-                </Order>
-            </PreviewOrderRequest>"""
-            
-            # Make API call for POST request
-            response = session.post(url, header_auth=True, headers=headers, data=payload)
-            logger.debug("Request Header: %s", response.request.headers)
-            logger.debug("Request payload: %s", payload)
-            
-            # Handle and parse response
-            if response is not None and response.status_code == 200:
-                parsed = json.loads(response.text)
-                logger.debug("Response Body: %s", json.dumps(parsed, indent=4, sort_keys=True))
-                data = response.json()
-                
-                if data is not None and "PreviewOrderResponse" in data:
-                    return data["PreviewOrderResponse"]
-                else:
-                    raise Exception("Failed to preview order with E*TRADE API")
-            else:
-                raise Exception(f"E*TRADE API request failed with status code: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"Failed to preview equity order: {e}")
-            raise
+        payload = _PREVIEW_ORDER_XML.substitute(
+            client_order_id=next(_client_order_ids),
+            order=_order_xml(symbol, order_action, quantity, price_type, order_term, limit_price)
+        )
+        return self._call(
+            "POST", _PATHS["preview"], account_id_key, content=payload,
+            response_key="PreviewOrderResponse", action="preview equity order"
+        )
+    
+    def _preview_order_id(
+        self,
+        account_id_key: str,
+        symbol: str,
+        order_action: str,
+        quantity: int,
+        price_type: str,
+        order_term: str,
+        limit_price: Optional[float]
+    ) -> str:
+        """Preview an order on the XML endpoint and return only its preview ID."""
+        payload = _PREVIEW_ORDER_XML.substitute(
+            client_order_id=next(_client_order_ids),
+            order=_order_xml(symbol, order_action, quantity, price_type, order_term, limit_price)
+        )
+        root = self._call(
+            "POST", _PATHS["preview_xml"], account_id_key, content=payload,
+            decode=etree.fromstring, action="preview equity order"
+        )
+        preview_id = root.findtext("PreviewIds/previewId")
+        if not preview_id:
+            raise Exception("Failed to get preview ID from E*TRADE API")
+        return preview_id
     
     def place_equity_order(
         self,
@@ -130,79 +196,19 @@ class ETradeOrderService:
         Returns:
             Dictionary containing order placement information
         """
-        if not self.auth_service.is_authenticated():
-            raise ValueError("Not authenticated with E*TRADE. Complete OAuth flow first.")
+        # First preview the order to get preview ID
+        preview_id = self._preview_order_id(
+            account_id_key, symbol, order_action, quantity, price_type, order_term, limit_price
+        )
         
-        try:
-            # First preview the order to get preview ID
-            preview_response = self.preview_equity_order(
-                account_id_key, symbol, order_action, quantity, price_type, order_term, limit_price
-            )
-            
-            # Extract preview ID
-            if "PreviewIds" in preview_response and len(preview_response["PreviewIds"]) > 0:
-                preview_id = preview_response["PreviewIds"][0]["previewId"]
-            else:
-                raise Exception("Failed to get preview ID from E*TRADE API")
-            
-            session = self.auth_service.get_session()
-            base_url = self.auth_service.get_base_url()
-            
-            # URL for the API endpoint
-            url = f"{base_url}/v1/accounts/{account_id_key}/orders/place.json"
-            
-            # Add parameters and header information
-            from ..utils.config_manager import ConfigManager
-            config_manager = ConfigManager()
-            
-            headers = {"Content-Type": "application/xml", "consumerKey": config_manager.get_consumer_key()}
-            
-            # Create XML payload
-            payload = f"""<PlaceOrderRequest>
-                <previewIds>
-                    <previewId>{preview_id}</previewId>
-                </previewIds>
-                <orderType>EQ</orderType>
-                <Order>
-                    <allOrNone>false</allOrNone>
-                    <priceType>{price_type}</priceType>
-                    <orderTerm>{order_term}</orderTerm>
-                    <marketSession>REGULAR</marketSession>
-                    <stopPrice></stopPrice>
-                    <limitPrice>{limit_price if limit_price else ""}</limitPrice>
-                    <Instrument>
-                        <Product>
-                            <securityType>EQ</securityType>
-                            <symbol>{symbol}</symbol>
-                        </Product>
-                        <orderAction>{order_action}</orderAction>
-                        <quantityType>QUANTITY</quantityType>
-                        <quantity>{quantity}</quantity>
-                    </Instrument>
-                </Order>
-            </PlaceOrderRequest>"""
-            
-            # Make API call for POST request
-            response = session.post(url, header_auth=True, headers=headers, data=payload)
-            logger.debug("Request Header: %s", response.request.headers)
-            logger.debug("Request payload: %s", payload)
-            
-            # Handle and parse response
-            if response is not None and response.status_code == 200:
-                parsed = json.loads(response.text)
-                logger.debug("Response Body: %s", json.dumps(parsed, indent=4, sort_keys=True))
-                data = response.json()
-                
-                if data is not None and "PlaceOrderResponse" in data:
-                    return data["PlaceOrderResponse"]
-                else:
-                    raise Exception("Failed to place order with E*TRADE API")
-            else:
-                raise Exception(f"E*TRADE API request failed with status code: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"Failed to place equity order: {e}")
-            raise
+        payload = _PLACE_ORDER_XML.substitute(
+            preview_id=escape(str(preview_id)),
+            order=_order_xml(symbol, order_action, quantity, price_type, order_term, limit_price)
+        )
+        return self._call(
+            "POST", _PATHS["place"], account_id_key, content=payload,
+            response_key="PlaceOrderResponse", action="place equity order"
+        )
     
     def get_order_list(self, account_id_key: str, status: str = "OPEN") -> Dict[str, Any]:
         """
@@ -215,46 +221,47 @@ class ETradeOrderService:
         Returns:
             Dictionary containing order list information
         """
-        if not self.auth_service.is_authenticated():
-            raise ValueError("Not authenticated with E*TRADE. Complete OAuth flow first.")
+        return self._call(
+            "GET", _PATHS["list"], account_id_key, params={"status": status},
+            response_key="OrdersResponse", accept_204=True, action="get order list"
+        )
+    
+    def get_order_lists(
+        self,
+        account_id_keys: List[str],
+        status: str = "OPEN",
+        max_workers: int = _ACCOUNT_FANOUT_LIMIT
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve order lists for several accounts concurrently on a thread pool.
         
-        try:
-            session = self.auth_service.get_session()
-            base_url = self.auth_service.get_base_url()
-            
-            # URL for the API endpoint
-            url = f"{base_url}/v1/accounts/{account_id_key}/orders.json"
-            
-            # Add parameters and header information
-            from ..utils.config_manager import ConfigManager
-            config_manager = ConfigManager()
-            
-            params = {"status": status}
-            headers = {"consumerkey": config_manager.get_consumer_key()}
+        Args:
+            account_id_keys: accountIdKeys to fetch
+            status: Order status (OPEN, EXECUTED, CANCELLED, INDIVIDUAL_FILLS, REJECTED, EXPIRED)
+            max_workers: Maximum concurrent requests
             
-            # Make API call for GET request
-            response = session.get(url, header_auth=True, params=params, headers=headers)
-            logger.debug("Request Header: %s", response.request.headers)
+        Returns:
+            Order list information keyed by accountIdKey
+        """
+        return map_in_threads(
+            lambda account_id_key: self.get_order_list(account_id_key, status), account_id_keys, max_workers
+        )
+    
+    async def aget_order_list(self, account_id_key: str, status: str = "OPEN") -> Dict[str, Any]:
+        """
+        Retrieve list of orders without blocking the event loop.
+        
+        Args:
+            account_id_key: The accountIdKey for the account
+            status: Order status (OPEN, EXECUTED, CANCELLED, INDIVIDUAL_FILLS, REJECTED, EXPIRED)
             
-            # Handle and parse response
-            if response is not None and response.status_code == 200:
-                parsed = json.loads(response.text)
-                logger.debug("Response Body: %s", json.dumps(parsed, indent=4, sort_keys=True))
-                data = response.json()
-                
-                if data is not None and "OrdersResponse" in data:
-                    return data["OrdersResponse"]
-                else:
-                    raise Exception("Failed to retrieve order list from E*TRADE API")
-            elif response is not None and response.status_code == 204:
-                # No content - no orders
-                return {}
-            else:
-                raise Exception(f"E*TRADE API request failed with status code: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"Failed to get order list: {e}")
-            raise
+        Returns:
+            Dictionary containing order list information
+        """
+        return await self._acall(
+            "GET", _PATHS["list"], account_id_key, params={"status": status},
+            response_key="OrdersResponse", accept_204=True, action="get order list"
+        )
     
     def cancel_order(self, account_id_key: str, order_id: str) -> Dict[str, Any]:
         """
@@ -267,45 +274,8 @@ class ETradeOrderService:
         Returns:
             Dictionary containing cancellation information
         """
-        if not self.auth_service.is_authenticated():
-            raise ValueError("Not authenticated with E*TRADE. Complete OAuth flow first.")
-        
-        try:
-            session = self.auth_service.get_session()
-            base_url = self.auth_service.get_base_url()
-            
-            # URL for the API endpoint
-            url = f"{base_url}/v1/accounts/{account_id_key}/orders/cancel.json"
-            
-            # Add parameters and header information
-            from ..utils.config_manager import ConfigManager
-            config_manager = ConfigManager()
-            
-            headers = {"Content-Type": "application/xml", "consumerKey": config_manager.get_consumer_key()}
-            
-            # Create XML payload
-            payload = f"""<CancelOrderRequest>
-                <orderId>{order_id}</orderId>
-            </CancelOrderRequest>"""
-            
-            # Make API call for PUT request
-            response = session.put(url, header_auth=True, headers=headers, data=payload)
-            logger.debug("Request Header: %s", response.request.headers)
-            logger.debug("Request payload: %s", payload)
-            
-            # Handle and parse response
-            if response is not None and response.status_code == 200:
-                parsed = json.loads(response.text)
-                logger.debug("Response Body: %s", json.dumps(parsed, indent=4, sort_keys=True))
-                data = response.json()
-                
-                if data is not None and "CancelOrderResponse" in data:
-                    return data["CancelOrderResponse"]
-                else:
-                    raise Exception("Failed to cancel order with E*TRADE API")
-            else:
-                raise Exception(f"E*TRADE API request failed with status code: {response.status_code}")
-                
-        except Exception as e:
-            logger.error(f"Failed to cancel order: {e}")
-            raise
\ No newline at end of file
+        return self._call(
+            "PUT", _PATHS["cancel"], account_id_key,
+            content=_CANCEL_ORDER_XML.substitute(order_id=escape(str(order_id))),
+            response_key="CancelOrderResponse", action="cancel order"
+        )
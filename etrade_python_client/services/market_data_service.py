@@ -1,26 +1,133 @@
 """Market data service using Yahoo Finance for real-time data and news."""
 
+import re
 import asyncio
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-from decimal import Decimal
 
+import numpy as np
+import requests
 import yfinance as yf
-import pandas as pd
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database.models import MarketSentiment
-from ..utils.config_manager import ConfigManager
+from ..utils.config_manager import get_config_manager
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the kernel as plain NumPy code."""
+        return lambda func: func
 
 logger = logging.getLogger(__name__)
 
+# Per-symbol Yahoo Finance responses are reused for this long
+_QUOTE_CACHE_TTL_SECONDS = 30
+_NEWS_CACHE_TTL_SECONDS = 300
+_CACHE_MAX_SYMBOLS = 512
+
+# Pooled Yahoo Finance connections; matches the default to_thread executor's worker cap
+_HTTP_POOL_SIZE = 32
+
+# Keyword scores of recently seen headlines, so periodic batches skip rescoring them
+_HEADLINE_SCORE_CACHE_SIZE = 10_000
+
+# OHLCV columns used by the history summaries and indicators
+_HISTORY_FIELDS = ('Close', 'High', 'Low', 'Volume')
+
+# Headline sentiment keywords, found in one regex pass and signed via a lookup table
+_POSITIVE_KEYWORDS = (
+    'beats', 'exceeds', 'strong', 'growth', 'rise', 'gain', 'up',
+    'bull', 'positive', 'outperform', 'upgrade', 'buy', 'bullish',
+    'rally', 'surge', 'jump', 'soar', 'boost', 'optimistic'
+)
+_NEGATIVE_KEYWORDS = (
+    'misses', 'falls', 'decline', 'drop', 'down', 'bear', 'negative',
+    'underperform', 'downgrade', 'sell', 'bearish', 'crash', 'plunge',
+    'tumble', 'slump', 'concern', 'worry', 'risk', 'pessimistic'
+)
+_KEYWORD_SIGNS = {
+    **{keyword: 1 for keyword in _POSITIVE_KEYWORDS},
+    **{keyword: -1 for keyword in _NEGATIVE_KEYWORDS}
+}
+_KEYWORD_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, _KEYWORD_SIGNS)) + r')\b')
+
+
+@njit(cache=True, nogil=True)
+def _sma_last(arr: np.ndarray, window: int) -> float:
+    """Simple moving average at the last index."""
+    return arr[-window:].mean()
+
+
+@njit(cache=True, nogil=True)
+def _rsi_last(arr: np.ndarray, period: int) -> float:
+    """RSI at the last index from the average gain/loss of the last `period` changes."""
+    gain = 0.0
+    loss = 0.0
+    for i in range(len(arr) - period, len(arr)):
+        change = arr[i] - arr[i - 1]
+        if change > 0:
+            gain += change
+        else:
+            loss -= change
+    
+    if loss == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+@njit(cache=True, nogil=True)
+def _bb_last(arr: np.ndarray, window: int):
+    """Bollinger Band (mean, sample std) over the last window."""
+    tail = arr[-window:]
+    mean = tail.mean()
+    sq_sum = 0.0
+    for value in tail:
+        sq_sum += (value - mean) ** 2
+    return mean, np.sqrt(sq_sum / (window - 1))
+
 
 class MarketDataService:
     """Service for fetching market data and news from Yahoo Finance."""
     
     def __init__(self):
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config_manager()
+        self._quote_cache = TTLCache(maxsize=_CACHE_MAX_SYMBOLS, ttl=_QUOTE_CACHE_TTL_SECONDS)
+        self._news_cache = TTLCache(maxsize=_CACHE_MAX_SYMBOLS, ttl=_NEWS_CACHE_TTL_SECONDS)
+        self._headline_scores = LRUCache(maxsize=_HEADLINE_SCORE_CACHE_SIZE)
+        
+        # One keep-alive session shared by every Yahoo Finance request, sized for the to_thread pool
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+        self._http.mount('https://', adapter)
+    
+    def close(self):
+        """Close the pooled Yahoo Finance connections."""
+        self._http.close()
+    
+    async def _get_ticker_info(self, symbol: str) -> Dict[str, Any]:
+        """Get a symbol's Yahoo Finance info, reusing a recent response when cached."""
+        info = self._quote_cache.get(symbol)
+        if info is None:
+            info = await asyncio.to_thread(lambda: yf.Ticker(symbol, session=self._http).info)
+            self._quote_cache[symbol] = info
+        return info
+    
+    async def _get_ticker_news(self, symbol: str) -> List[Dict[str, Any]]:
+        """Get a symbol's Yahoo Finance news, reusing a recent response when cached."""
+        news = self._news_cache.get(symbol)
+        if news is None:
+            news = await asyncio.to_thread(lambda: yf.Ticker(symbol, session=self._http).news) or []
+            self._news_cache[symbol] = news
+        return news
     
     async def get_real_time_quote(self, symbol: str) -> Dict[str, Any]:
         """
@@ -32,10 +139,11 @@ class MarketDataService:
         Returns:
             Dictionary containing current quote data
         """
+        now = datetime.now()
+        
         try:
             # Run yfinance in thread to avoid blocking
-            ticker = await asyncio.to_thread(yf.Ticker, symbol)
-            info = await asyncio.to_thread(lambda: ticker.info)
+            info = await self._get_ticker_info(symbol)
             
             # Extract key quote data
             quote_data = {
@@ -47,7 +155,7 @@ class MarketDataService:
                 'volume': info.get('volume', 0),
                 'market_cap': info.get('marketCap', 0),
                 'pe_ratio': info.get('forwardPE', 0.0),
-                'timestamp': datetime.now(),
+                'timestamp': now,
                 'change': 0.0,
                 'change_percent': 0.0
             }
@@ -68,7 +176,7 @@ class MarketDataService:
             return {
                 'symbol': symbol,
                 'error': str(e),
-                'timestamp': datetime.now()
+                'timestamp': now
             }
     
     async def get_historical_data(
@@ -88,31 +196,38 @@ class MarketDataService:
         Returns:
             Dictionary containing historical data and technical indicators
         """
+        now = datetime.now()
+        
         try:
-            ticker = await asyncio.to_thread(yf.Ticker, symbol)
             hist = await asyncio.to_thread(
-                lambda: ticker.history(period=period, interval=interval)
+                lambda: yf.Ticker(symbol, session=self._http).history(period=period, interval=interval)
             )
             
             if hist.empty:
                 return {'symbol': symbol, 'error': 'No historical data available'}
             
+            # Extract each column once as a contiguous float64 array
+            close, high, low, volume = (
+                np.ascontiguousarray(hist[field].to_numpy(dtype=np.float64))
+                for field in _HISTORY_FIELDS
+            )
+            
             # Calculate technical indicators
-            technical_data = await self._calculate_technical_indicators(hist)
+            technical_data = self._calculate_technical_indicators(close, high, low)
             
             # Convert to serializable format
             historical_data = {
                 'symbol': symbol,
                 'period': period,
                 'interval': interval,
-                'data_points': len(hist),
-                'latest_close': float(hist['Close'].iloc[-1]),
-                'latest_volume': int(hist['Volume'].iloc[-1]),
-                'high_52w': float(hist['High'].max()),
-                'low_52w': float(hist['Low'].min()),
-                'avg_volume': int(hist['Volume'].mean()),
+                'data_points': len(close),
+                'latest_close': close[-1].item(),
+                'latest_volume': int(volume[-1]),
+                'high_52w': np.nanmax(high).item(),
+                'low_52w': np.nanmin(low).item(),
+                'avg_volume': int(np.nanmean(volume)),
                 'technical_indicators': technical_data,
-                'timestamp': datetime.now()
+                'timestamp': now
             }
             
             logger.info(f"📊 Historical data for {symbol}: {len(hist)} data points")
@@ -123,42 +238,41 @@ class MarketDataService:
             return {
                 'symbol': symbol,
                 'error': str(e),
-                'timestamp': datetime.now()
+                'timestamp': now
             }
     
-    async def _calculate_technical_indicators(self, hist: pd.DataFrame) -> Dict[str, float]:
-        """Calculate basic technical indicators from historical data."""
+    def _calculate_technical_indicators(
+        self,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray
+    ) -> Dict[str, float]:
+        """Calculate basic technical indicators from close/high/low price arrays."""
         try:
             indicators = {}
             
             # Simple Moving Averages
-            if len(hist) >= 20:
-                indicators['sma_20'] = float(hist['Close'].rolling(window=20).mean().iloc[-1])
-            if len(hist) >= 50:
-                indicators['sma_50'] = float(hist['Close'].rolling(window=50).mean().iloc[-1])
-            
-            # Relative Strength Index (RSI)
-            if len(hist) >= 14:
-                delta = hist['Close'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rs = gain / loss
-                rsi = 100 - (100 / (1 + rs))
-                indicators['rsi'] = float(rsi.iloc[-1])
+            if len(close) >= 20:
+                indicators['sma_20'] = float(_sma_last(close, 20))
+            if len(close) >= 50:
+                indicators['sma_50'] = float(_sma_last(close, 50))
+            
+            # Relative Strength Index (RSI), needs one extra close for the first change
+            if len(close) > 14:
+                indicators['rsi'] = float(_rsi_last(close, 14))
             
             # Bollinger Bands
-            if len(hist) >= 20:
-                sma_20 = hist['Close'].rolling(window=20).mean()
-                std_20 = hist['Close'].rolling(window=20).std()
-                indicators['bb_upper'] = float((sma_20 + (std_20 * 2)).iloc[-1])
-                indicators['bb_lower'] = float((sma_20 - (std_20 * 2)).iloc[-1])
+            if len(close) >= 20:
+                sma_20, std_20 = _bb_last(close, 20)
+                indicators['bb_upper'] = float(sma_20 + std_20 * 2)
+                indicators['bb_lower'] = float(sma_20 - std_20 * 2)
                 indicators['bb_width'] = indicators['bb_upper'] - indicators['bb_lower']
             
             # Price position within recent range
-            if len(hist) >= 5:
-                recent_high = hist['High'].tail(5).max()
-                recent_low = hist['Low'].tail(5).min()
-                current_price = hist['Close'].iloc[-1]
+            if len(close) >= 5:
+                recent_high = high[-5:].max()
+                recent_low = low[-5:].min()
+                current_price = close[-1]
                 
                 if recent_high != recent_low:
                     indicators['price_position'] = float(
@@ -182,9 +296,10 @@ class MarketDataService:
         Returns:
             List of news headline dictionaries
         """
+        now = datetime.now()
+        
         try:
-            ticker = await asyncio.to_thread(yf.Ticker, symbol)
-            news = await asyncio.to_thread(lambda: ticker.news)
+            news = await self._get_ticker_news(symbol)
             
             if not news:
                 return []
@@ -198,7 +313,7 @@ class MarketDataService:
                     'publisher': item.get('publisher', ''),
                     'publish_time': datetime.fromtimestamp(
                         item.get('providerPublishTime', 0)
-                    ) if item.get('providerPublishTime') else datetime.now(),
+                    ) if item.get('providerPublishTime') else now,
                     'url': item.get('link', ''),
                     'symbol': symbol
                 }
@@ -221,37 +336,42 @@ class MarketDataService:
         
         Args:
             symbols: List of stock symbols to analyze
-            db: Database session
+            db: Database session; the caller commits the stored rows
             
         Returns:
             Dictionary mapping symbols to sentiment scores
         """
         sentiment_results = {}
+        sentiment_rows = []
         
-        for symbol in symbols:
+        # Fetch headlines for all symbols concurrently, then score them in one synchronous pass
+        all_headlines = await asyncio.gather(
+            *(self.get_news_headlines(symbol, limit=5) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        for symbol, headlines in zip(symbols, all_headlines):
             try:
-                # Get news headlines
-                headlines = await self.get_news_headlines(symbol, limit=5)
+                if isinstance(headlines, Exception):
+                    raise headlines
                 
                 if not headlines:
                     sentiment_results[symbol] = 0.0
                     continue
                 
                 # Simple sentiment analysis based on keywords
-                sentiment_score = await self._analyze_news_sentiment(headlines)
+                sentiment_score = self._analyze_news_sentiment(headlines)
                 sentiment_results[symbol] = sentiment_score
                 
                 # Store in database
                 news_summary = '; '.join([h['title'] for h in headlines[:3]])
                 
-                market_sentiment = MarketSentiment(
-                    symbol=symbol,
-                    sentiment_score=sentiment_score,
-                    news_summary=news_summary,
-                    source_count=len(headlines)
-                )
-                
-                db.add(market_sentiment)
+                sentiment_rows.append({
+                    'symbol': symbol,
+                    'sentiment_score': sentiment_score,
+                    'news_summary': news_summary,
+                    'source_count': len(headlines)
+                })
                 
                 logger.info(f"📊 Sentiment for {symbol}: {sentiment_score:.2f}")
                 
@@ -259,10 +379,12 @@ class MarketDataService:
                 logger.error(f"❌ Failed sentiment analysis for {symbol}: {e}")
                 sentiment_results[symbol] = 0.0
         
-        await db.commit()
+        # One executemany INSERT for the whole batch
+        if sentiment_rows:
+            await db.execute(insert(MarketSentiment), sentiment_rows)
         return sentiment_results
     
-    async def _analyze_news_sentiment(self, headlines: List[Dict[str, Any]]) -> float:
+    def _analyze_news_sentiment(self, headlines: List[Dict[str, Any]]) -> float:
         """
         Perform simple keyword-based sentiment analysis on news headlines.
         
@@ -271,35 +393,28 @@ class MarketDataService:
         - External sentiment analysis APIs
         - Pre-trained financial sentiment models
         """
-        positive_keywords = [
-            'beats', 'exceeds', 'strong', 'growth', 'rise', 'gain', 'up',
-            'bull', 'positive', 'outperform', 'upgrade', 'buy', 'bullish',
-            'rally', 'surge', 'jump', 'soar', 'boost', 'optimistic'
-        ]
-        
-        negative_keywords = [
-            'misses', 'falls', 'decline', 'drop', 'down', 'bear', 'negative',
-            'underperform', 'downgrade', 'sell', 'bearish', 'crash', 'plunge',
-            'tumble', 'slump', 'concern', 'worry', 'risk', 'pessimistic'
-        ]
+        now = datetime.now()
         
         total_score = 0.0
         total_weight = 0.0
         
         for headline in headlines:
-            text = (headline.get('title', '') + ' ' + headline.get('summary', '')).lower()
+            key = (headline.get('symbol'), headline.get('publish_time'), headline.get('title', ''))
+            if key in self._headline_scores:
+                headline_sentiment = self._headline_scores[key]
+            else:
+                headline_sentiment = self._score_headline(headline)
+                self._headline_scores[key] = headline_sentiment
             
-            positive_count = sum(1 for keyword in positive_keywords if keyword in text)
-            negative_count = sum(1 for keyword in negative_keywords if keyword in text)
+            if headline_sentiment is None:
+                continue
             
             # Weight recent news more heavily
-            age_hours = (datetime.now() - headline.get('publish_time', datetime.now())).total_seconds() / 3600
+            age_hours = (now - headline.get('publish_time', now)).total_seconds() / 3600
             weight = max(0.1, 1.0 - (age_hours / 72))  # Decay over 3 days
             
-            if positive_count + negative_count > 0:
-                headline_sentiment = (positive_count - negative_count) / (positive_count + negative_count)
-                total_score += headline_sentiment * weight
-                total_weight += weight
+            total_score += headline_sentiment * weight
+            total_weight += weight
         
         if total_weight > 0:
             final_sentiment = total_score / total_weight
@@ -309,6 +424,24 @@ class MarketDataService:
         # Clamp to [-1, 1] range
         return max(-1.0, min(1.0, final_sentiment))
     
+    @staticmethod
+    def _score_headline(headline: Dict[str, Any]) -> Optional[float]:
+        """Keyword sentiment of one headline in [-1, 1], or None if it has no keywords."""
+        text = (headline.get('title', '') + ' ' + headline.get('summary', '')).lower()
+        
+        # Tally each distinct keyword once by its sign
+        positive_count = 0
+        negative_count = 0
+        for keyword in set(_KEYWORD_RE.findall(text)):
+            if _KEYWORD_SIGNS[keyword] > 0:
+                positive_count += 1
+            else:
+                negative_count += 1
+        
+        if positive_count + negative_count == 0:
+            return None
+        return (positive_count - negative_count) / (positive_count + negative_count)
+    
     async def get_market_overview(self) -> Dict[str, Any]:
         """
         Get overall market overview with major indices.
@@ -316,6 +449,8 @@ class MarketDataService:
         Returns:
             Dictionary containing market overview data
         """
+        now = datetime.now()
+        
         indices = {
             'S&P 500': '^GSPC',
             'Dow Jones': '^DJI',
@@ -326,39 +461,69 @@ class MarketDataService:
         
         market_data = {}
         
-        for name, symbol in indices.items():
-            try:
-                quote = await self.get_real_time_quote(symbol)
-                market_data[name] = {
-                    'price': quote.get('current_price', 0.0),
-                    'change': quote.get('change', 0.0),
-                    'change_percent': quote.get('change_percent', 0.0)
-                }
-            except Exception as e:
-                logger.error(f"❌ Failed to get data for {name}: {e}")
-                market_data[name] = {'error': str(e)}
+        # Fetch all index quotes concurrently
+        quotes = await asyncio.gather(
+            *(self.get_real_time_quote(symbol) for symbol in indices.values()),
+            return_exceptions=True
+        )
         
-        market_data['timestamp'] = datetime.now()
+        for name, quote in zip(indices, quotes):
+            if isinstance(quote, Exception):
+                logger.error(f"❌ Failed to get data for {name}: {quote}")
+                market_data[name] = {'error': str(quote)}
+                continue
+            
+            market_data[name] = {
+                'price': quote.get('current_price', 0.0),
+                'change': quote.get('change', 0.0),
+                'change_percent': quote.get('change_percent', 0.0)
+            }
+        
+        market_data['timestamp'] = now
         return market_data
     
     async def get_watchlist_data(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """
         Get comprehensive data for a list of symbols (watchlist) using a single batch request.
         """
+        now = datetime.now()
+        
         if not symbols:
             return []
 
         try:
-            # Use yf.Tickers for batch requests
-            tickers = await asyncio.to_thread(yf.Tickers, ' '.join(symbols))
+            # Use yf.Tickers to fetch historical data for all tickers at once
+            hist_df = await asyncio.to_thread(
+                lambda: yf.Tickers(' '.join(symbols), session=self._http).history(period="1mo", interval="1d")
+            )
+            
+            # Per-symbol contiguous column arrays, built once instead of an xs() frame per symbol;
+            # rows where the symbol has no close (gaps in the aligned batch frame) are dropped
+            arrays_by_symbol = {}
+            for symbol in symbols:
+                if symbol not in hist_df['Close']:
+                    continue
+                columns = {
+                    field: hist_df[field][symbol].to_numpy(dtype=np.float64)
+                    for field in _HISTORY_FIELDS
+                }
+                traded = ~np.isnan(columns['Close'])
+                arrays_by_symbol[symbol] = {
+                    field: np.ascontiguousarray(values[traded])
+                    for field, values in columns.items()
+                }
             
-            # Fetch historical data for all tickers at once
-            hist_df = await asyncio.to_thread(tickers.history, period="1mo", interval="1d")
+            # Fetch quote info for all symbols concurrently instead of one request at a time
+            infos = await asyncio.gather(
+                *(self._get_ticker_info(symbol) for symbol in symbols),
+                return_exceptions=True
+            )
             
             watchlist_data = []
-            for symbol in symbols:
+            for symbol, ticker_info in zip(symbols, infos):
                 try:
-                    ticker_info = tickers.tickers[symbol].info
+                    if isinstance(ticker_info, Exception):
+                        raise ticker_info
                     
                     # Process quote data
                     quote_data = {
@@ -370,7 +535,7 @@ class MarketDataService:
                         'volume': ticker_info.get('volume', 0),
                         'market_cap': ticker_info.get('marketCap', 0),
                         'pe_ratio': ticker_info.get('forwardPE', 0.0),
-                        'timestamp': datetime.now(),
+                        'timestamp': now,
                         'change': 0.0,
                         'change_percent': 0.0
                     }
@@ -381,28 +546,30 @@ class MarketDataService:
                         quote_data['change_percent'] = (quote_data['change'] / previous) * 100
 
                     # Process historical data and technical indicators
-                    hist_symbol_df = hist_df.xs(symbol, level=1, axis=1)
-                    technical_data = await self._calculate_technical_indicators(hist_symbol_df)
+                    arrays = arrays_by_symbol[symbol]
+                    technical_data = self._calculate_technical_indicators(
+                        arrays['Close'], arrays['High'], arrays['Low']
+                    )
                     
                     historical_data = {
                         'symbol': symbol,
                         'period': '1mo',
                         'interval': '1d',
-                        'data_points': len(hist_symbol_df),
-                        'latest_close': float(hist_symbol_df['Close'].iloc[-1]),
-                        'latest_volume': int(hist_symbol_df['Volume'].iloc[-1]),
-                        'high_52w': float(hist_symbol_df['High'].max()),
-                        'low_52w': float(hist_symbol_df['Low'].min()),
-                        'avg_volume': int(hist_symbol_df['Volume'].mean()),
+                        'data_points': len(arrays['Close']),
+                        'latest_close': arrays['Close'][-1].item(),
+                        'latest_volume': int(arrays['Volume'][-1]),
+                        'high_52w': np.nanmax(arrays['High']).item(),
+                        'low_52w': np.nanmin(arrays['Low']).item(),
+                        'avg_volume': int(np.nanmean(arrays['Volume'])),
                         'technical_indicators': technical_data,
-                        'timestamp': datetime.now()
+                        'timestamp': now
                     }
 
                     watchlist_data.append({
                         'symbol': symbol,
                         'quote': quote_data,
                         'historical': historical_data,
-                        'timestamp': datetime.now()
+                        'timestamp': now
                     })
 
                 except Exception as e:
@@ -410,11 +577,11 @@ class MarketDataService:
                     watchlist_data.append({
                         'symbol': symbol,
                         'error': f"Failed to process data: {e}",
-                        'timestamp': datetime.now()
+                        'timestamp': now
                     })
 
             return watchlist_data
 
         except Exception as e:
             logger.error(f"❌ Failed to get watchlist data in batch: {e}")
-            return [{'symbol': s, 'error': str(e), 'timestamp': datetime.now()} for s in symbols]
\ No newline at end of file
+            return [{'symbol': s, 'error': str(e), 'timestamp': now} for s in symbols]
\ No newline at end of file
@@ -2,9 +2,17 @@
 
 import smtplib
 import ssl
+import queue
+import random
 import logging
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from string import Template
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import asyncio
 
 try:
@@ -15,21 +23,353 @@ except ImportError:
     SLACK_AVAILABLE = False
 
 from ..database.models import AIDecision, PortfolioAnalytics, DecisionType
-from ..utils.config_manager import ConfigManager
+from ..utils.config_manager import get_config_manager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_SMTP_TIMEOUT_SECONDS = 30
+
+# Pooled SMTP connections are capped below provider per-account limits and recycled periodically
+_SMTP_DEFAULT_MAX_CONNECTIONS = 3
+_SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+# Large batches stop early once this share of messages has failed
+_BATCH_ABORT_MIN_SIZE = 30
+_BATCH_ABORT_FAILURE_RATIO = 3
+
+# The SMTP worker thread sends everything already queued as one batch, up to this many emails
+_SMTP_WORKER_MAX_BATCH = 100
+_SMTP_WORKER_STOP = object()
+
+# Rate-limited or failing Slack calls are retried with jittered exponential backoff
+_RETRY_MAX_ATTEMPTS = 8
+_RETRY_BACKOFF_MAX_SECONDS = 30.0
+
+# Slack concurrency adapts AIMD-style: grows while calls are fast, halves on 429/5xx
+_SLACK_INITIAL_CONCURRENCY = 4
+_SLACK_MIN_CONCURRENCY = 1
+_SLACK_MAX_CONCURRENCY = 16
+_AIMD_INCREASE = 0.5
+_AIMD_DECREASE = 0.5
+_AIMD_TARGET_LATENCY_SECONDS = 0.5
+_AIMD_LATENCY_WINDOW = 20
+_SLACK_DEFAULT_MAX_PER_MINUTE = 60
+
+# Styling lookups shared by every alert
+_DECISION_COLORS = {
+    DecisionType.BUY: '#4caf50',
+    DecisionType.SELL: '#f44336',
+    DecisionType.HOLD: '#ff9800'
+}
+_DECISION_EMOJIS = {
+    DecisionType.BUY: '🟢',
+    DecisionType.SELL: '🔴',
+    DecisionType.HOLD: '🟡'
+}
+_SEVERITY_EMOJIS = {
+    'info': '💡',
+    'warning': '⚠️',
+    'error': '🚨',
+    'success': '✅'
+}
+_SEVERITY_COLORS = {
+    'info': '#2196f3',
+    'warning': '#ff9800',
+    'error': '#f44336',
+    'success': '#4caf50'
+}
+
+# Email bodies are parsed once at import; formatters only substitute pre-formatted values
+_TRADING_ALERT_HTML = Template("""
+        <html>
+        <body style="font-family: Arial, sans-serif; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2 style="color: #1976d2; margin-bottom: 20px;">🤖 AI Trading Alert</h2>
+                
+                <div style="background: #f5f5f5; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
+                    <h3 style="margin: 0 0 10px 0;">${symbol}</h3>
+                    <div style="display: flex; align-items: center; gap: 10px;">
+                        <span style="font-size: 24px; font-weight: bold;">$$${current_price}</span>
+                        <span style="color: ${price_color}; font-weight: bold;">
+                            ${change_percent}%
+                        </span>
+                    </div>
+                    <div style="margin-top: 5px; color: #666;">
+                        Volume: ${volume}
+                    </div>
+                </div>
+                
+                <div style="background: ${decision_color}; color: white; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
+                    <h3 style="margin: 0 0 10px 0;">AI Decision: ${decision_type}</h3>
+                    <div style="opacity: 0.9;">
+                        Confidence: ${confidence}
+                    </div>
+                    ${price_target}
+                </div>
+                
+                <div style="background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
+                    <h4 style="margin: 0 0 10px 0; color: #333;">Rationale:</h4>
+                    <p style="margin: 0; line-height: 1.5;">${rationale}</p>
+                </div>
+                
+                <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #ddd; color: #666; font-size: 12px;">
+                    Generated at: ${generated_at}<br>
+                    Decision ID: ${decision_id}
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+_SYSTEM_ALERT_HTML = Template("""
+        <html>
+        <body style="font-family: Arial, sans-serif; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <div style="background: ${color}; color: white; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
+                    <h2 style="margin: 0;">${title}</h2>
+                    <div style="opacity: 0.9; margin-top: 5px;">Severity: ${severity}</div>
+                </div>
+                
+                <div style="background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
+                    <p style="margin: 0; line-height: 1.5;">${message}</p>
+                </div>
+                
+                <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #ddd; color: #666; font-size: 12px;">
+                    Generated at: ${generated_at}
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+_PORTFOLIO_SUMMARY_HTML = Template("""
+        <html>
+        <body style="font-family: Arial, sans-serif; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2 style="color: #1976d2; margin-bottom: 20px;">📊 Portfolio Summary</h2>
+                
+                <div style="background: #f5f5f5; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
+                    <h3 style="margin: 0 0 15px 0;">Portfolio Value</h3>
+                    <div style="font-size: 28px; font-weight: bold; margin-bottom: 10px;">
+                        $$${total_value}
+                    </div>
+                    <div style="display: flex; justify-content: space-between;">
+                        <span>Cash: $$${cash_balance}</span>
+                        <span>Positions: $$${positions_value}</span>
+                    </div>
+                </div>
+                
+                <div style="display: flex; gap: 15px; margin-bottom: 20px;">
+                    <div style="flex: 1; background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
+                        <h4 style="margin: 0 0 10px 0;">Total P&L</h4>
+                        <div style="font-size: 20px; font-weight: bold; color: ${total_color};">
+                            $$${total_gain_loss}
+                        </div>
+                        <div style="color: ${total_color};">
+                            ${total_gain_loss_percent}%
+                        </div>
+                    </div>
+                    
+                    <div style="flex: 1; background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
+                        <h4 style="margin: 0 0 10px 0;">Daily P&L</h4>
+                        <div style="font-size: 20px; font-weight: bold; color: ${daily_color};">
+                            $$${daily_gain_loss}
+                        </div>
+                        <div style="color: ${daily_color};">
+                            ${daily_gain_loss_percent}%
+                        </div>
+                    </div>
+                </div>
+                
+                <div style="background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
+                    <h4 style="margin: 0 0 10px 0;">Risk Metrics</h4>
+                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+                        <span>Risk Score:</span>
+                        <span>${risk_score}</span>
+                    </div>
+                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
+                        <span>Diversification Score:</span>
+                        <span>${diversification_score}</span>
+                    </div>
+                    <div style="display: flex; justify-content: space-between;">
+                        <span>Beta:</span>
+                        <span>${beta}</span>
+                    </div>
+                </div>
+                
+                <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #ddd; color: #666; font-size: 12px;">
+                    Generated at: ${generated_at}
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with up to a second of random jitter."""
+    return min(_RETRY_BACKOFF_MAX_SECONDS, 2 ** (attempt - 1)) + random.uniform(0, 1)
+
+
+def _slack_retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """Delay before retrying a Slack 429/5xx, honouring Retry-After; None when a retry cannot help."""
+    if not SLACK_AVAILABLE or not isinstance(error, SlackApiError):
+        return None
+    
+    status = getattr(error.response, 'status_code', None)
+    if status == 429:
+        headers = getattr(error.response, 'headers', None) or {}
+        retry_after = headers.get('Retry-After') or headers.get('retry-after')
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            return _backoff_delay(attempt)
+    if status is not None and status >= 500:
+        return _backoff_delay(attempt)
+    return None
+
+
+async def _retry_async(
+    func: Callable[..., Awaitable[Any]],
+    *args: Any,
+    retry_delay: Callable[[Exception, int], Optional[float]],
+    max_attempts: int = _RETRY_MAX_ATTEMPTS,
+    **kwargs: Any
+) -> Any:
+    """
+    Await an async call, retrying transient failures.
+    
+    Args:
+        func: Coroutine function
+        args: Positional arguments for func
+        retry_delay: Maps (error, attempt) to seconds to wait, or None to give up
+        max_attempts: Maximum number of calls
+        kwargs: Keyword arguments for func
+        
+    Returns:
+        The callable's result
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            delay = retry_delay(e, attempt) if attempt < max_attempts else None
+            if delay is None:
+                raise
+            logger.warning(f"⚠️ {func.__name__} failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def _resolve_future(future: asyncio.Future, result: bool):
+    """Complete a send future on its event loop unless the caller has given up on it."""
+    if not future.done():
+        future.set_result(result)
+
+
+class _AIMDLimiter:
+    """
+    Adaptive concurrency limit with a sliding-window rate cap.
+    
+    The limit grows additively while recent calls stay under the target latency and
+    is cut multiplicatively when the provider signals congestion.
+    """
+    
+    def __init__(self, max_per_minute: int):
+        self.limit = float(_SLACK_INITIAL_CONCURRENCY)
+        self.max_per_minute = max_per_minute
+        self._in_flight = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self._latencies: "deque[float]" = deque(maxlen=_AIMD_LATENCY_WINDOW)
+        self._sent_at: "deque[float]" = deque()
+    
+    async def acquire(self):
+        """Wait for a free concurrency slot and room in the per-minute window."""
+        while self._in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # Woken but cancelled: pass the free slot on
+                    self._wake_waiters()
+                raise
+        self._in_flight += 1
+        
+        try:
+            await self._wait_if_throttled()
+        except BaseException:
+            self._in_flight -= 1
+            self._wake_waiters()
+            raise
+    
+    async def _wait_if_throttled(self):
+        """Sleep until the sliding one-minute window has room for another call."""
+        while True:
+            now = time.monotonic()
+            while self._sent_at and self._sent_at[0] <= now - 60:
+                self._sent_at.popleft()
+            if len(self._sent_at) < self.max_per_minute:
+                self._sent_at.append(now)
+                return
+            await asyncio.sleep(self._sent_at[0] + 60 - now)
+    
+    def release(self, latency: float, congested: bool):
+        """Free a slot and adapt the limit from the call's outcome."""
+        self._in_flight -= 1
+        
+        if congested:
+            self.limit = max(_SLACK_MIN_CONCURRENCY, self.limit * _AIMD_DECREASE)
+            self._latencies.clear()
+        else:
+            self._latencies.append(latency)
+            if sum(self._latencies) / len(self._latencies) <= _AIMD_TARGET_LATENCY_SECONDS:
+                self.limit = min(_SLACK_MAX_CONCURRENCY, self.limit + _AIMD_INCREASE)
+        
+        self._wake_waiters()
+    
+    def _wake_waiters(self):
+        """Wake as many waiters as there are free slots."""
+        free = int(self.limit) - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class _PooledSMTP:
+    """SMTP connection held by the pool, with the number of messages sent on it."""
+    
+    __slots__ = ('server', 'messages_sent')
+    
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages_sent = 0
+
 
 class NotificationService:
     """Service for sending email and Slack notifications."""
     
     def __init__(self):
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config_manager()
         self.smtp_server = None
         self.slack_client = None
         self._initialize_services()
+        
+        # Idle connections are reused most-recently-used first; the semaphore caps open connections
+        max_connections = self.smtp_config['max_connections'] if self.smtp_config else 1
+        self._smtp_idle: "queue.LifoQueue[_PooledSMTP]" = queue.LifoQueue()
+        self._smtp_slots = threading.BoundedSemaphore(max_connections)
+        
+        # Alert emails are handed to one long-lived worker thread instead of the default executor
+        self._smtp_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._smtp_worker: Optional[threading.Thread] = None
+        self._smtp_worker_lock = threading.Lock()
     
     def _initialize_services(self):
         """Initialize email and Slack services."""
@@ -46,8 +386,13 @@ class NotificationService:
                     'port': smtp_port,
                     'username': smtp_username,
                     'password': smtp_password,
-                    'use_tls': self.config_manager.config.getboolean('NOTIFICATIONS', 'smtp_use_tls', fallback=True)
+                    'use_tls': self.config_manager.config.getboolean('NOTIFICATIONS', 'smtp_use_tls', fallback=True),
+                    'max_connections': max(1, self.config_manager.config.getint(
+                        'NOTIFICATIONS', 'smtp_max_connections', fallback=_SMTP_DEFAULT_MAX_CONNECTIONS
+                    ))
                 }
+                # Loading the CA bundle is costly; one context is shared by every connection
+                self._ssl_context = ssl.create_default_context()
                 logger.info("📧 Email service initialized")
             else:
                 self.smtp_config = None
@@ -66,6 +411,9 @@ class NotificationService:
                 if slack_token and slack_channel:
                     self.slack_client = WebClient(token=slack_token)
                     self.slack_channel = slack_channel
+                    self._slack_limiter = _AIMDLimiter(self.config_manager.config.getint(
+                        'NOTIFICATIONS', 'slack_max_per_minute', fallback=_SLACK_DEFAULT_MAX_PER_MINUTE
+                    ))
                     logger.info("📱 Slack service initialized")
                 else:
                     self.slack_client = None
@@ -103,15 +451,13 @@ class NotificationService:
             change_percent = market_data.get('change_percent', 0)
             volume = market_data.get('volume', 0)
             
-            # Create message content
-            message_content = self._format_trading_alert(
-                decision, current_price, change_percent, volume
-            )
-            
             results = {}
             
-            # Send email notification
+            # Send email notification; content is only formatted for channels that will send
             if self.smtp_config and recipients:
+                message_content = self._format_trading_alert(
+                    decision, current_price, change_percent, volume
+                )
                 email_result = await self._send_email(
                     subject=subject,
                     content=message_content,
@@ -161,13 +507,7 @@ class NotificationService:
         """
         try:
             # Add emoji based on severity
-            emoji_map = {
-                'info': '💡',
-                'warning': '⚠️',
-                'error': '🚨',
-                'success': '✅'
-            }
-            emoji = emoji_map.get(severity, '📢')
+            emoji = _SEVERITY_EMOJIS.get(severity, '📢')
             
             subject = f"{emoji} Trading System Alert: {title}"
             
@@ -219,7 +559,9 @@ class NotificationService:
             Dict with success status for each service
         """
         try:
-            subject = f"📊 Daily Portfolio Summary - {analytics.timestamp.strftime('%Y-%m-%d')}"
+            # Shared by the subject and the Slack header
+            report_date = analytics.timestamp.strftime('%Y-%m-%d')
+            subject = f"📊 Daily Portfolio Summary - {report_date}"
             
             results = {}
             
@@ -238,7 +580,7 @@ class NotificationService:
             
             # Send Slack notification
             if self.slack_client:
-                slack_message = self._format_slack_portfolio_summary(analytics)
+                slack_message = self._format_slack_portfolio_summary(analytics, report_date)
                 slack_result = await self._send_slack_message(
                     message=slack_message,
                     channel=self.slack_channel
@@ -265,35 +607,230 @@ class NotificationService:
             return False
             
         try:
-            # Send email
-            await asyncio.to_thread(self._send_smtp_email, content, subject, recipients)
-            
-            logger.info(f"📧 Email sent successfully to {len(recipients)} recipients")
-            return True
+            # Queue for the SMTP worker thread and wait for its result
+            self._ensure_smtp_worker()
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._smtp_queue.put((loop, future, subject, content, recipients))
+            sent = await future
             
         except Exception as e:
             logger.error(f"❌ Failed to send email: {e}")
             return False
-    
-    def _send_smtp_email(self, msg_content: str, subject: str, recipients: List[str]):
-        """Send SMTP email (synchronous)."""
-        context = ssl.create_default_context()
         
-        with smtplib.SMTP(self.smtp_config['host'], self.smtp_config['port']) as server:
-            if self.smtp_config['use_tls']:
-                server.starttls(context=context)
+        if sent:
+            logger.info(f"📧 Email sent successfully to {len(recipients)} recipients")
+        return sent
+    
+    def _ensure_smtp_worker(self):
+        """Start the SMTP worker thread if it is not running."""
+        with self._smtp_worker_lock:
+            if self._smtp_worker is None or not self._smtp_worker.is_alive():
+                self._smtp_worker = threading.Thread(target=self._smtp_loop, name="smtp-worker", daemon=True)
+                self._smtp_worker.start()
+    
+    def _smtp_loop(self):
+        """Worker thread: send queued emails, coalescing everything already waiting into one batch."""
+        stop = False
+        while not stop:
+            item = self._smtp_queue.get()
+            if item is _SMTP_WORKER_STOP:
+                return
+            
+            batch = [item]
+            while len(batch) < _SMTP_WORKER_MAX_BATCH:
+                try:
+                    item = self._smtp_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _SMTP_WORKER_STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            try:
+                results = self._send_smtp_batch([
+                    (subject, content, recipients) for _, _, subject, content, recipients in batch
+                ])
+            except Exception as e:
+                logger.error(f"❌ Failed to send email batch: {e}")
+                results = [False] * len(batch)
             
+            for (loop, future, *_), sent in zip(batch, results):
+                try:
+                    loop.call_soon_threadsafe(_resolve_future, future, sent)
+                except RuntimeError:
+                    # The caller's event loop has already closed
+                    pass
+    
+    def _connect_smtp(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        server = smtplib.SMTP(
+            self.smtp_config['host'], self.smtp_config['port'], timeout=_SMTP_TIMEOUT_SECONDS
+        )
+        try:
+            server.ehlo()
+            if self.smtp_config['use_tls']:
+                server.starttls(context=self._ssl_context)
+                server.ehlo()
             server.login(self.smtp_config['username'], self.smtp_config['password'])
+        except Exception:
+            server.close()
+            raise
+        
+        logger.info(f"📧 Connected to SMTP server {self.smtp_config['host']}")
+        return server
+    
+    def _acquire_smtp(self) -> _PooledSMTP:
+        """Check out a live pooled SMTP connection, opening one if needed; blocks while all are in use."""
+        self._smtp_slots.acquire()
+        try:
+            while True:
+                try:
+                    conn = self._smtp_idle.get_nowait()
+                except queue.Empty:
+                    return _PooledSMTP(self._connect_smtp())
+                
+                try:
+                    if conn.server.noop()[0] == 250:
+                        return conn
+                except smtplib.SMTPException:
+                    pass
+                self._close_smtp(conn.server)
+        except Exception:
+            self._smtp_slots.release()
+            raise
+    
+    def _release_smtp(self, conn: _PooledSMTP, reusable: bool):
+        """Return a connection to the pool, or close it if it failed or reached its message limit."""
+        try:
+            if reusable and conn.messages_sent < _SMTP_MAX_MESSAGES_PER_CONNECTION:
+                self._smtp_idle.put(conn)
+            else:
+                self._close_smtp(conn.server)
+        finally:
+            self._smtp_slots.release()
+    
+    @staticmethod
+    def _close_smtp(server: smtplib.SMTP):
+        """Quit an SMTP connection, dropping the socket if the server is already gone."""
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def _build_message(self, msg_content: str, subject: str, recipients: List[str]) -> EmailMessage:
+        """Build an HTML email message with proper Date and Message-ID headers."""
+        sender = self.smtp_config['username']
+        
+        message = EmailMessage()
+        message['Subject'] = subject
+        message['From'] = sender
+        message['To'] = ', '.join(recipients)
+        message['Date'] = formatdate(localtime=True)
+        # Take the Message-ID domain from the sender so make_msgid never does a hostname lookup
+        message['Message-ID'] = make_msgid(domain=sender.rpartition('@')[2] or None)
+        message.set_content(msg_content, subtype='html')
+        return message
+    
+    def _sendmail(self, conn: _PooledSMTP, recipients: List[str], message: EmailMessage) -> _PooledSMTP:
+        """
+        Send one message on a pooled connection, replacing the connection if it is used up or dropped.
+        
+        Args:
+            conn: Connection checked out of the pool
+            recipients: Envelope recipients
+            message: Message to send
             
-            # Create email message manually
-            message = f"""Subject: {subject}
-From: {self.smtp_config['username']}
-To: {', '.join(recipients)}
-Content-Type: text/html; charset=utf-8
-
-{msg_content}"""
+        Returns:
+            The connection the message was sent on, which the caller must release
+        """
+        if conn.messages_sent >= _SMTP_MAX_MESSAGES_PER_CONNECTION:
+            self._close_smtp(conn.server)
+            conn = _PooledSMTP(self._connect_smtp())
+        
+        try:
+            conn.server.send_message(message, to_addrs=recipients)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError):
+            # The server dropped the idle connection between the probe and the send; retry once
+            self._close_smtp(conn.server)
+            conn = _PooledSMTP(self._connect_smtp())
+            try:
+                conn.server.send_message(message, to_addrs=recipients)
+            except Exception:
+                self._close_smtp(conn.server)
+                raise
+        
+        conn.messages_sent += 1
+        return conn
+    
+    def _send_smtp_batch(self, items: List[Tuple[str, str, List[str]]]) -> List[bool]:
+        """Send several emails over one pooled connection (synchronous)."""
+        results: List[bool] = []
+        failures = 0
+        abort_after = len(items) // _BATCH_ABORT_FAILURE_RATIO if len(items) >= _BATCH_ABORT_MIN_SIZE else None
+        
+        conn = self._acquire_smtp()
+        reusable = True
+        try:
+            for subject, content, recipients in items:
+                if abort_after is not None and failures > abort_after:
+                    logger.error(f"❌ Aborting email batch after {failures} failures")
+                    break
+                
+                try:
+                    conn = self._sendmail(conn, recipients, self._build_message(content, subject, recipients))
+                    results.append(True)
+                except Exception as e:
+                    logger.error(f"❌ Failed to send email '{subject}': {e}")
+                    failures += 1
+                    reusable = False
+                    results.append(False)
+        finally:
+            self._release_smtp(conn, reusable)
+        
+        # Messages skipped by an early abort count as failed
+        results.extend([False] * (len(items) - len(results)))
+        return results
+    
+    async def send_batch(self, items: List[Tuple[str, str, List[str]]]) -> List[bool]:
+        """
+        Send several HTML emails over a single SMTP connection.
+        
+        Args:
+            items: (subject, html_content, recipients) for each email
             
-            server.sendmail(self.smtp_config['username'], recipients, message.encode('utf-8'))
+        Returns:
+            Success status for each item, in order
+        """
+        if not self.smtp_config or not items:
+            return [False] * len(items)
+        
+        try:
+            results = await asyncio.to_thread(self._send_smtp_batch, items)
+        except Exception as e:
+            logger.error(f"❌ Failed to send email batch: {e}")
+            return [False] * len(items)
+        
+        logger.info(f"📧 Email batch sent: {sum(results)}/{len(items)} succeeded")
+        return results
+    
+    async def aclose(self):
+        """Stop the SMTP worker after it drains its queue, then close all idle pooled SMTP connections."""
+        worker = self._smtp_worker
+        if worker is not None and worker.is_alive():
+            self._smtp_queue.put(_SMTP_WORKER_STOP)
+            await asyncio.to_thread(worker.join)
+        
+        def close():
+            while True:
+                try:
+                    conn = self._smtp_idle.get_nowait()
+                except queue.Empty:
+                    return
+                self._close_smtp(conn.server)
+        
+        await asyncio.to_thread(close)
     
     async def _send_slack_message(self, message: str, channel: str) -> bool:
         """Send Slack message."""
@@ -301,9 +838,10 @@ Content-Type: text/html; charset=utf-8
             return False
             
         try:
-            # Send message using Slack SDK
-            response = await asyncio.to_thread(
-                self.slack_client.chat_postMessage,
+            # Send message using Slack SDK, backing off on rate limits and server errors
+            response = await _retry_async(
+                self._post_slack_message,
+                retry_delay=_slack_retry_delay,
                 channel=channel,
                 text=message,
                 mrkdwn=True
@@ -323,6 +861,20 @@ Content-Type: text/html; charset=utf-8
             logger.error(f"❌ Failed to send Slack message: {e}")
             return False
     
+    async def _post_slack_message(self, **kwargs: Any) -> Any:
+        """Call chat_postMessage under the adaptive Slack concurrency limit."""
+        await self._slack_limiter.acquire()
+        started = time.monotonic()
+        congested = False
+        try:
+            return await asyncio.to_thread(self.slack_client.chat_postMessage, **kwargs)
+        except Exception as e:
+            # 429s and 5xx are the provider pushing back
+            congested = _slack_retry_delay(e, 1) is not None
+            raise
+        finally:
+            self._slack_limiter.release(time.monotonic() - started, congested)
+    
     def _format_trading_alert(
         self, 
         decision: AIDecision, 
@@ -331,55 +883,29 @@ Content-Type: text/html; charset=utf-8
         volume: int
     ) -> str:
         """Format trading alert email content."""
-        decision_color = {
-            DecisionType.BUY: '#4caf50',
-            DecisionType.SELL: '#f44336',
-            DecisionType.HOLD: '#ff9800'
-        }.get(decision.decision_type, '#9e9e9e')
+        decision_color = _DECISION_COLORS.get(decision.decision_type, '#9e9e9e')
         
         price_color = '#4caf50' if change_percent > 0 else '#f44336'
-        change_sign = '+' if change_percent >= 0 else ''
         
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #1976d2; margin-bottom: 20px;">🤖 AI Trading Alert</h2>
-                
-                <div style="background: #f5f5f5; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
-                    <h3 style="margin: 0 0 10px 0;">{decision.symbol}</h3>
-                    <div style="display: flex; align-items: center; gap: 10px;">
-                        <span style="font-size: 24px; font-weight: bold;">${current_price:.2f}</span>
-                        <span style="color: {price_color}; font-weight: bold;">
-                            {change_sign}{change_percent:.2f}%
-                        </span>
-                    </div>
-                    <div style="margin-top: 5px; color: #666;">
-                        Volume: {volume:,}
-                    </div>
-                </div>
-                
-                <div style="background: {decision_color}; color: white; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
-                    <h3 style="margin: 0 0 10px 0;">AI Decision: {decision.decision_type.value}</h3>
-                    <div style="opacity: 0.9;">
-                        Confidence: {decision.confidence_score:.1%}
-                    </div>
-                    {f'<div style="opacity: 0.9;">Price Target: ${decision.price_target:.2f}</div>' if decision.price_target else ''}
-                </div>
-                
-                <div style="background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
-                    <h4 style="margin: 0 0 10px 0; color: #333;">Rationale:</h4>
-                    <p style="margin: 0; line-height: 1.5;">{decision.rationale}</p>
-                </div>
-                
-                <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #ddd; color: #666; font-size: 12px;">
-                    Generated at: {decision.created_at.strftime('%Y-%m-%d %H:%M:%S UTC')}<br>
-                    Decision ID: {decision.decision_id}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        price_target = (
+            f'<div style="opacity: 0.9;">Price Target: ${decision.price_target:.2f}</div>'
+            if decision.price_target else ''
+        )
+        
+        return _TRADING_ALERT_HTML.substitute(
+            symbol=decision.symbol,
+            current_price=f"{current_price:.2f}",
+            price_color=price_color,
+            change_percent=f"{change_percent:+.2f}",
+            volume=f"{volume:,}",
+            decision_color=decision_color,
+            decision_type=decision.decision_type.value,
+            confidence=f"{decision.confidence_score:.1%}",
+            price_target=price_target,
+            rationale=decision.rationale,
+            generated_at=decision.created_at.strftime('%Y-%m-%d %H:%M:%S UTC'),
+            decision_id=decision.decision_id
+        )
     
     def _format_slack_trading_alert(
         self, 
@@ -388,20 +914,15 @@ Content-Type: text/html; charset=utf-8
         change_percent: float
     ) -> str:
         """Format Slack trading alert message."""
-        decision_emoji = {
-            DecisionType.BUY: '🟢',
-            DecisionType.SELL: '🔴',
-            DecisionType.HOLD: '🟡'
-        }.get(decision.decision_type, '⚪')
+        decision_emoji = _DECISION_EMOJIS.get(decision.decision_type, '⚪')
         
         change_emoji = '📈' if change_percent > 0 else '📉'
-        change_sign = '+' if change_percent >= 0 else ''
         
         message = f"""🤖 *AI Trading Alert*
 
 {decision_emoji} *{decision.decision_type.value} {decision.symbol}*
 
-💰 Current Price: ${current_price:.2f} ({change_emoji} {change_sign}{change_percent:.2f}%)
+💰 Current Price: ${current_price:.2f} ({change_emoji} {change_percent:+.2f}%)
 🎯 Confidence: {decision.confidence_score:.1%}"""
 
         if decision.price_target:
@@ -413,109 +934,43 @@ Content-Type: text/html; charset=utf-8
     
     def _format_system_alert_email(self, title: str, message: str, severity: str) -> str:
         """Format system alert email content."""
-        severity_colors = {
-            'info': '#2196f3',
-            'warning': '#ff9800',
-            'error': '#f44336',
-            'success': '#4caf50'
-        }
-        color = severity_colors.get(severity, '#9e9e9e')
-        
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <div style="background: {color}; color: white; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
-                    <h2 style="margin: 0;">{title}</h2>
-                    <div style="opacity: 0.9; margin-top: 5px;">Severity: {severity.upper()}</div>
-                </div>
-                
-                <div style="background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
-                    <p style="margin: 0; line-height: 1.5;">{message}</p>
-                </div>
-                
-                <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #ddd; color: #666; font-size: 12px;">
-                    Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        color = _SEVERITY_COLORS.get(severity, '#9e9e9e')
+        
+        return _SYSTEM_ALERT_HTML.substitute(
+            color=color,
+            title=title,
+            severity=severity.upper(),
+            message=message,
+            generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+        )
     
     def _format_portfolio_summary_email(self, analytics: PortfolioAnalytics) -> str:
         """Format portfolio summary email content."""
         total_color = '#4caf50' if analytics.total_gain_loss >= 0 else '#f44336'
         daily_color = '#4caf50' if analytics.daily_gain_loss >= 0 else '#f44336'
         
-        return f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #1976d2; margin-bottom: 20px;">📊 Portfolio Summary</h2>
-                
-                <div style="background: #f5f5f5; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
-                    <h3 style="margin: 0 0 15px 0;">Portfolio Value</h3>
-                    <div style="font-size: 28px; font-weight: bold; margin-bottom: 10px;">
-                        ${analytics.total_value:.2f}
-                    </div>
-                    <div style="display: flex; justify-content: space-between;">
-                        <span>Cash: ${analytics.cash_balance:.2f}</span>
-                        <span>Positions: ${analytics.total_value - analytics.cash_balance:.2f}</span>
-                    </div>
-                </div>
-                
-                <div style="display: flex; gap: 15px; margin-bottom: 20px;">
-                    <div style="flex: 1; background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
-                        <h4 style="margin: 0 0 10px 0;">Total P&L</h4>
-                        <div style="font-size: 20px; font-weight: bold; color: {total_color};">
-                            ${analytics.total_gain_loss:.2f}
-                        </div>
-                        <div style="color: {total_color};">
-                            {analytics.total_gain_loss_percent:.2f}%
-                        </div>
-                    </div>
-                    
-                    <div style="flex: 1; background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
-                        <h4 style="margin: 0 0 10px 0;">Daily P&L</h4>
-                        <div style="font-size: 20px; font-weight: bold; color: {daily_color};">
-                            ${analytics.daily_gain_loss:.2f}
-                        </div>
-                        <div style="color: {daily_color};">
-                            {analytics.daily_gain_loss_percent:.2f}%
-                        </div>
-                    </div>
-                </div>
-                
-                <div style="background: white; border: 1px solid #ddd; padding: 15px; border-radius: 8px;">
-                    <h4 style="margin: 0 0 10px 0;">Risk Metrics</h4>
-                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-                        <span>Risk Score:</span>
-                        <span>{analytics.risk_score:.2f}</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; margin-bottom: 5px;">
-                        <span>Diversification Score:</span>
-                        <span>{analytics.diversification_score:.2f}</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between;">
-                        <span>Beta:</span>
-                        <span>{analytics.beta:.2f}</span>
-                    </div>
-                </div>
-                
-                <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #ddd; color: #666; font-size: 12px;">
-                    Generated at: {analytics.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        return _PORTFOLIO_SUMMARY_HTML.substitute(
+            total_value=f"{analytics.total_value:.2f}",
+            cash_balance=f"{analytics.cash_balance:.2f}",
+            positions_value=f"{analytics.total_value - analytics.cash_balance:.2f}",
+            total_color=total_color,
+            total_gain_loss=f"{analytics.total_gain_loss:.2f}",
+            total_gain_loss_percent=f"{analytics.total_gain_loss_percent:.2f}",
+            daily_color=daily_color,
+            daily_gain_loss=f"{analytics.daily_gain_loss:.2f}",
+            daily_gain_loss_percent=f"{analytics.daily_gain_loss_percent:.2f}",
+            risk_score=f"{analytics.risk_score:.2f}",
+            diversification_score=f"{analytics.diversification_score:.2f}",
+            beta=f"{analytics.beta:.2f}",
+            generated_at=analytics.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')
+        )
     
-    def _format_slack_portfolio_summary(self, analytics: PortfolioAnalytics) -> str:
+    def _format_slack_portfolio_summary(self, analytics: PortfolioAnalytics, report_date: str) -> str:
         """Format Slack portfolio summary message."""
         total_emoji = '📈' if analytics.total_gain_loss >= 0 else '📉'
         daily_emoji = '📈' if analytics.daily_gain_loss >= 0 else '📉'
         
-        return f"""📊 *Portfolio Summary* - {analytics.timestamp.strftime('%Y-%m-%d')}
+        return f"""📊 *Portfolio Summary* - {report_date}
 
 💰 *Portfolio Value:* ${analytics.total_value:,.2f}
 💵 Cash: ${analytics.cash_balance:,.2f} | 📈 Positions: ${analytics.total_value - analytics.cash_balance:,.2f}
@@ -529,5 +984,22 @@ Content-Type: text/html; charset=utf-8
 • Beta: {analytics.beta:.2f}"""
 
 
-# Global instance
-notification_service = NotificationService()
\ No newline at end of file
+# Process-wide instance, created on first use
+_instance: Optional[NotificationService] = None
+_instance_lock = threading.Lock()
+
+
+def get_notification_service() -> NotificationService:
+    """Return the process-wide NotificationService, initializing it on first use."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = NotificationService()
+    return _instance
+
+
+async def close_notification_service():
+    """Close the NotificationService's connections if it was ever created."""
+    if _instance is not None:
+        await _instance.aclose()
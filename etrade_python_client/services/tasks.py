@@ -1,58 +1,130 @@
 """Celery tasks for background processing."""
 
 import os
-import shutil
+import re
+import heapq
+import sqlite3
 import logging
+from contextlib import closing
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import asyncio
 from decimal import Decimal
 
 from celery import Task
-from sqlalchemy import select, delete
+from celery.signals import worker_process_shutdown, worker_shutdown
+from redis import Redis
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 from .celery_app import celery_app
-from ..database.database import get_db_session, init_database
+from ..database.database import (
+    bulk_insert_analytics, close_database, drop_expired_partitions, ensure_monthly_partitions,
+    init_database, session_scope
+)
 from ..database.models import (
     PortfolioAnalytics, AIDecision, MarketSentiment, UserPreferences, 
     AILearningContext, BackupLog, DecisionType, UserFeedback
 )
-from ..utils.config_manager import ConfigManager
+from ..utils.config_manager import get_config_manager
 from .market_data_service import MarketDataService
 from .ai_trading_service import AITradingService
 from .etrade_auth import ETradeAuth
 from .etrade_account_service import ETradeAccountService
+from .etrade_order_service import ETradeOrderService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize services
-config_manager = ConfigManager()
+config_manager = get_config_manager()
 market_service = MarketDataService()
 ai_service = AITradingService()
 
 # E*TRADE services
 etrade_auth = ETradeAuth()
 etrade_account_service = ETradeAccountService(etrade_auth)
+etrade_order_service = ETradeOrderService(etrade_auth)
+
+# Health checks reuse one pooled broker client; a dead connection is dropped and redialed on the next ping
+_REDIS_HEALTH_TIMEOUT_SECONDS = 1
+redis_client = Redis.from_url(
+    config_manager.get_celery_broker_url(),
+    socket_timeout=_REDIS_HEALTH_TIMEOUT_SECONDS,
+    socket_connect_timeout=_REDIS_HEALTH_TIMEOUT_SECONDS,
+    health_check_interval=30
+)
+
+# Pages copied per online backup step; SQLite releases its read lock between steps
+_BACKUP_PAGES_PER_STEP = 1024
+_BACKUP_STEP_SLEEP_SECONDS = 0.001
+
+# Old backup files unlinked at once during backup cleanup; only files named like
+# backup_database's output (trading_assistant_backup_YYYYmmdd_HHMMSS.db) are considered
+_BACKUP_REMOVAL_CONCURRENCY = 8
+_BACKUP_FILENAME_MATCH = re.compile(r"trading_assistant_backup_\d{8}_\d{6}\.db").fullmatch
+
+# Decisions processed at once by learn_from_feedback during AI learning optimization,
+# streamed from the database in batches of this size
+_LEARN_FEEDBACK_CONCURRENCY = 16
+_FEEDBACK_STREAM_BATCH_SIZE = 200
+
+
+# One event loop per worker process, kept open between tasks so the pooled database
+# engine and async HTTP clients bound to it are reused instead of rebuilt per task
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get this process's task event loop, creating it on first use (uvloop when installed)."""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
 
 
 class AsyncTask(Task):
-    """Base task class that handles async operations."""
+    """Base task class that runs coroutine tasks on the worker process's event loop."""
     
     def __call__(self, *args, **kwargs):
         """Execute async task function."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self.run(*args, **kwargs))
-        finally:
-            loop.close()
-    
-    async def run(self, *args, **kwargs):
-        """Override this method in subclasses."""
-        raise NotImplementedError
+        return _get_worker_loop().run_until_complete(self.run(*args, **kwargs))
+
+
+@worker_process_shutdown.connect
+def close_worker_loop(**kwargs):
+    """Release the loop-bound database and HTTP connections, then close the task event loop."""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        return
+    try:
+        _worker_loop.run_until_complete(etrade_auth.aclose())
+        _worker_loop.run_until_complete(close_database())
+    finally:
+        _worker_loop.close()
+        _worker_loop = None
+
+
+@worker_shutdown.connect
+def close_http_clients(**kwargs):
+    """Close the pooled market data and E*TRADE HTTP connections when the worker stops."""
+    market_service.close()
+    etrade_auth.close()
+    redis_client.close()
+
+
+def _backup_sqlite(db_path: str, backup_path: str):
+    """Copy a live SQLite database with the online backup API, which stays consistent under concurrent writes."""
+    with closing(sqlite3.connect(db_path)) as source, closing(sqlite3.connect(backup_path)) as target:
+        source.backup(target, pages=_BACKUP_PAGES_PER_STEP, sleep=_BACKUP_STEP_SLEEP_SECONDS)
 
 
 @celery_app.task(bind=True, base=AsyncTask)
@@ -77,14 +149,15 @@ async def backup_database(self):
             
             # Copy database file
             if os.path.exists(db_path):
-                shutil.copy2(db_path, backup_path)
+                # Copy off the event loop so other tasks keep running during large backups
+                await asyncio.to_thread(_backup_sqlite, db_path, backup_path)
                 backup_size = os.path.getsize(backup_path)
                 
                 logger.info(f"✅ Database backup created: {backup_path} ({backup_size} bytes)")
                 
                 # Record backup in database
                 await init_database()
-                async with get_db_session().__anext__() as session:
+                async with session_scope() as session:
                     backup_log = BackupLog(
                         backup_filename=backup_filename,
                         backup_path=backup_path,
@@ -92,7 +165,6 @@ async def backup_database(self):
                         status="completed"
                     )
                     session.add(backup_log)
-                    await session.commit()
                 
                 # Clean up old backups
                 await cleanup_old_backups()
@@ -119,7 +191,7 @@ async def backup_database(self):
         # Log failed backup
         try:
             await init_database()
-            async with get_db_session().__anext__() as session:
+            async with session_scope() as session:
                 backup_log = BackupLog(
                     backup_filename=f"failed_backup_{timestamp}",
                     backup_path="",
@@ -128,7 +200,6 @@ async def backup_database(self):
                     error_message=error_msg
                 )
                 session.add(backup_log)
-                await session.commit()
         except Exception as log_error:
             logger.error(f"❌ Failed to log backup error: {log_error}")
         
@@ -144,23 +215,34 @@ async def cleanup_old_backups():
         if not os.path.exists(backup_dir):
             return
         
-        # Get all backup files sorted by modification time (newest first)
-        backup_files = []
-        for filename in os.listdir(backup_dir):
-            if filename.startswith('trading_assistant_backup_') and filename.endswith('.db'):
-                filepath = os.path.join(backup_dir, filename)
-                backup_files.append((filepath, os.path.getmtime(filepath)))
+        # scandir yields the directory entries and their paths in one pass; d_type answers is_file() without a stat
+        with os.scandir(backup_dir) as entries:
+            backup_files = [
+                (entry.path, entry.stat().st_mtime) for entry in entries
+                if _BACKUP_FILENAME_MATCH(entry.name) and entry.is_file()
+            ]
+        
+        if len(backup_files) <= retention_count:
+            return
+        
+        # Keep the newest retention_count backups without sorting the whole directory
+        newest = {filepath for filepath, _ in heapq.nlargest(retention_count, backup_files, key=lambda x: x[1])}
+        files_to_remove = [entry for entry in backup_files if entry[0] not in newest]
+        # Unlink concurrently on worker threads; on network filesystems each removal is a round trip
+        semaphore = asyncio.Semaphore(_BACKUP_REMOVAL_CONCURRENCY)
         
-        backup_files.sort(key=lambda x: x[1], reverse=True)
+        async def remove(filepath: str):
+            async with semaphore:
+                await asyncio.to_thread(os.remove, filepath)
         
-        # Remove old backups
-        files_to_remove = backup_files[retention_count:]
-        for filepath, _ in files_to_remove:
-            try:
-                os.remove(filepath)
+        results = await asyncio.gather(
+            *(remove(filepath) for filepath, _ in files_to_remove), return_exceptions=True
+        )
+        for (filepath, _), outcome in zip(files_to_remove, results):
+            if isinstance(outcome, Exception):
+                logger.error(f"❌ Failed to remove backup {filepath}: {outcome}")
+            else:
                 logger.info(f"🗑️ Removed old backup: {os.path.basename(filepath)}")
-            except Exception as e:
-                logger.error(f"❌ Failed to remove backup {filepath}: {e}")
                 
     except Exception as e:
         logger.error(f"❌ Backup cleanup failed: {e}")
@@ -173,48 +255,44 @@ async def cleanup_old_data(self):
         logger.info("🧹 Starting data cleanup...")
         
         await init_database()
-        async with get_db_session().__anext__() as session:
+        async with session_scope() as session:
             retention_days = config_manager.get_data_retention_days()
             cutoff_date = datetime.now() - timedelta(days=retention_days)
             
-            # Clean up old portfolio analytics
-            result = await session.execute(
-                delete(PortfolioAnalytics).where(
-                    PortfolioAnalytics.timestamp < cutoff_date
-                )
-            )
-            portfolio_deleted = result.rowcount
+            # On Postgres, expired months are dropped whole; the DELETE below only
+            # touches the partially expired boundary month
+            await ensure_monthly_partitions()
+            partitions_dropped = await drop_expired_partitions('portfolio_analytics', cutoff_date)
             
-            # Clean up old market sentiment data
-            result = await session.execute(
-                delete(MarketSentiment).where(
+            # All three deletes share the session's transaction, so SQLite syncs the WAL once at commit
+            deletes = {
+                "portfolio_analytics": delete(PortfolioAnalytics).where(
+                    PortfolioAnalytics.timestamp < cutoff_date
+                ),
+                "market_sentiment": delete(MarketSentiment).where(
                     MarketSentiment.analyzed_at < cutoff_date
-                )
-            )
-            sentiment_deleted = result.rowcount
-            
-            # Clean up old AI decisions (keep decisions with feedback)
-            result = await session.execute(
-                delete(AIDecision).where(
+                ),
+                # Keep decisions with feedback
+                "ai_decisions": delete(AIDecision).where(
                     AIDecision.created_at < cutoff_date,
                     AIDecision.user_feedback.is_(None)
                 )
-            )
-            decisions_deleted = result.rowcount
-            
-            await session.commit()
+            }
+            deleted_counts = {}
+            for table, statement in deletes.items():
+                result = await session.execute(statement)
+                deleted_counts[table] = result.rowcount
             
             logger.info(f"✅ Data cleanup completed:")
-            logger.info(f"   - Portfolio records: {portfolio_deleted}")
-            logger.info(f"   - Sentiment records: {sentiment_deleted}")
-            logger.info(f"   - AI decisions: {decisions_deleted}")
+            logger.info(f"   - Portfolio records: {deleted_counts['portfolio_analytics']} (+{partitions_dropped} partitions dropped)")
+            logger.info(f"   - Sentiment records: {deleted_counts['market_sentiment']}")
+            logger.info(f"   - AI decisions: {deleted_counts['ai_decisions']}")
             
             return {
                 "status": "success",
-                "deleted_counts": {
-                    "portfolio_analytics": portfolio_deleted,
-                    "market_sentiment": sentiment_deleted,
-                    "ai_decisions": decisions_deleted
+                "deleted_counts": deleted_counts,
+                "partitions_dropped": {
+                    "portfolio_analytics": partitions_dropped
                 },
                 "cutoff_date": cutoff_date.isoformat()
             }
@@ -232,7 +310,7 @@ async def update_market_sentiment(self):
         logger.info("📊 Updating market sentiment...")
         
         await init_database()
-        async with get_db_session().__anext__() as session:
+        async with session_scope() as session:
             # Get user watchlist
             result = await session.execute(select(UserPreferences).limit(1))
             preferences = result.scalar_one_or_none()
@@ -241,11 +319,37 @@ async def update_market_sentiment(self):
                 logger.info("ℹ️ No watchlist symbols configured")
                 return {"status": "success", "message": "No watchlist symbols to update"}
             
-            # Update sentiment for watchlist symbols
-            sentiment_results = await market_service.analyze_market_sentiment_batch(
-                preferences.watchlist_symbols, session
+            # Gather quotes and headlines for the whole watchlist
+            symbols = preferences.watchlist_symbols
+            quotes = await asyncio.gather(
+                *(market_service.get_real_time_quote(symbol) for symbol in symbols)
+            )
+            headlines = await asyncio.gather(
+                *(market_service.get_news_headlines(symbol, limit=5) for symbol in symbols)
             )
             
+            # Analyze the whole watchlist with a single Gemini call
+            symbols_data = {
+                symbol: (quote, [h.get('title', '') for h in news])
+                for symbol, quote, news in zip(symbols, quotes, headlines)
+            }
+            sentiments = await ai_service.analyze_market_sentiment_batch(symbols_data)
+            
+            sentiment_results = {}
+            sentiment_rows = []
+            for symbol, news in zip(symbols, headlines):
+                sentiment_score, sentiment_summary = sentiments[symbol]
+                sentiment_rows.append({
+                    "symbol": symbol,
+                    "sentiment_score": sentiment_score,
+                    "news_summary": sentiment_summary,
+                    "source_count": len(news)
+                })
+                sentiment_results[symbol] = sentiment_score
+            
+            # One executemany INSERT for the whole watchlist instead of a flush per ORM object
+            await session.execute(insert(MarketSentiment), sentiment_rows)
+            
             logger.info(f"✅ Market sentiment updated for {len(sentiment_results)} symbols")
             
             return {
@@ -267,26 +371,27 @@ async def optimize_ai_learning(self):
         logger.info("🧠 Optimizing AI learning...")
         
         await init_database()
-        async with get_db_session().__anext__() as session:
-            # Get recent decisions with feedback
+        async with session_scope() as session:
+            # Count recent feedback per outcome in the database rather than loading every decision
+            recent_feedback = (
+                AIDecision.user_feedback.is_not(None),
+                AIDecision.feedback_timestamp > datetime.now() - timedelta(days=30)
+            )
             result = await session.execute(
-                select(AIDecision).where(
-                    AIDecision.user_feedback.is_not(None),
-                    AIDecision.feedback_timestamp > datetime.now() - timedelta(days=30)
-                )
+                select(AIDecision.user_feedback, func.count())
+                .where(*recent_feedback)
+                .group_by(AIDecision.user_feedback)
             )
-            decisions_with_feedback = result.scalars().all()
+            feedback_counts = dict(result.all())
             
-            if not decisions_with_feedback:
+            if not feedback_counts:
                 logger.info("ℹ️ No recent feedback to learn from")
                 return {"status": "success", "message": "No feedback data available"}
             
             # Analyze feedback patterns
-            total_feedback = len(decisions_with_feedback)
-            positive_feedback = len([d for d in decisions_with_feedback 
-                                   if d.user_feedback == UserFeedback.POSITIVE])
-            negative_feedback = len([d for d in decisions_with_feedback 
-                                   if d.user_feedback == UserFeedback.NEGATIVE])
+            total_feedback = sum(feedback_counts.values())
+            positive_feedback = feedback_counts.get(UserFeedback.POSITIVE, 0)
+            negative_feedback = feedback_counts.get(UserFeedback.NEGATIVE, 0)
             
             # Calculate performance metrics
             accuracy_rate = positive_feedback / total_feedback if total_feedback > 0 else 0
@@ -331,11 +436,26 @@ async def optimize_ai_learning(self):
             )
             
             session.add(new_context)
-            await session.commit()
             
-            # Process individual decisions for learning
-            for decision in decisions_with_feedback:
-                await ai_service.learn_from_feedback(decision)
+            # Process individual decisions for learning concurrently; one failure doesn't abort the batch
+            semaphore = asyncio.Semaphore(_LEARN_FEEDBACK_CONCURRENCY)
+            
+            async def learn(decision: AIDecision):
+                async with semaphore:
+                    return await ai_service.learn_from_feedback(decision)
+            
+            # Stream decisions a batch at a time and detach each processed batch, so memory stays bounded
+            decisions = await session.stream_scalars(
+                select(AIDecision)
+                .where(*recent_feedback)
+                .execution_options(yield_per=_FEEDBACK_STREAM_BATCH_SIZE)
+            )
+            async for batch in decisions.partitions():
+                results = await asyncio.gather(*(learn(decision) for decision in batch), return_exceptions=True)
+                for decision, outcome in zip(batch, results):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"❌ Failed to learn from feedback on decision {decision.decision_id}: {outcome}")
+                    session.expunge(decision)
             
             logger.info(f"✅ AI learning optimization completed:")
             logger.info(f"   - Total feedback: {total_feedback}")
@@ -371,8 +491,6 @@ def health_check(self):
         
         # Test Redis connection
         try:
-            from redis import Redis
-            redis_client = Redis.from_url(config_manager.get_celery_broker_url())
             redis_client.ping()
             health_status["redis"] = "healthy"
         except Exception as e:
@@ -416,7 +534,7 @@ async def sync_etrade_portfolio(self):
             return {"status": "skipped", "message": "E*TRADE not authenticated"}
         
         await init_database()
-        async with get_db_session().__anext__() as session:
+        async with session_scope() as session:
             # Get E*TRADE account list
             accounts = etrade_account_service.get_account_list()
             
@@ -424,58 +542,59 @@ async def sync_etrade_portfolio(self):
                 logger.info("ℹ️ No E*TRADE accounts found")
                 return {"status": "skipped", "message": "No E*TRADE accounts found"}
             
+            # Fetch every account's positions concurrently on the shared async client, decoded
+            # straight into typed structs so the aggregation below reads attributes, not dict keys
+            syncable_accounts = [account for account in accounts if account.get("accountIdKey")]
+            account_positions = await asyncio.gather(
+                *(etrade_account_service.aget_positions(account["accountIdKey"]) for account in syncable_accounts),
+                return_exceptions=True
+            )
+            
             # Process each account
-            for account in accounts:
+            analytics_rows = []
+            for account, account_position_list in zip(syncable_accounts, account_positions):
                 account_id = account.get("accountId", "")
-                account_id_key = account.get("accountIdKey", "")
-                
-                if not account_id_key:
-                    continue
                 
                 try:
-                    # Get portfolio data
-                    portfolio_data = etrade_account_service.get_portfolio(account_id_key)
+                    if isinstance(account_position_list, Exception):
+                        raise account_position_list
                     
                     # Create portfolio analytics record
-                    if "AccountPortfolio" in portfolio_data:
+                    if account_position_list:
                         # Calculate total value and positions
                         total_value = 0.0
                         daily_change = 0.0
                         positions = {}
                         
-                        for account_portfolio in portfolio_data["AccountPortfolio"]:
-                            if "Position" in account_portfolio:
-                                for position in account_portfolio["Position"]:
-                                    symbol = position.get("symbolDescription", "")
-                                    market_value = position.get("marketValue", 0.0)
-                                    total_gain = position.get("totalGain", 0.0)
-                                    
-                                    positions[symbol] = {
-                                        "quantity": position.get("quantity", 0),
-                                        "market_value": market_value,
-                                        "total_gain": total_gain,
-                                        "price_paid": position.get("pricePaid", 0.0),
-                                        "last_trade": position.get("Quick", {}).get("lastTrade", 0.0) if position.get("Quick") else 0.0
-                                    }
-                                    
-                                    total_value += market_value
-                                    daily_change += total_gain
-                        
-                        # Create portfolio analytics record
-                        portfolio_analytics = PortfolioAnalytics(
-                            account_id=account_id,
-                            total_value=total_value,
-                            daily_change=daily_change,
-                            positions=positions
-                        )
+                        for position in account_position_list:
+                            market_value = position.market_value
+                            total_gain = position.total_gain
+                            
+                            positions[position.symbol_description] = {
+                                "quantity": position.quantity,
+                                "market_value": market_value,
+                                "total_gain": total_gain,
+                                "price_paid": position.price_paid,
+                                "last_trade": position.quick.last_trade if position.quick else 0.0
+                            }
+                            
+                            total_value += market_value
+                            daily_change += total_gain
                         
-                        session.add(portfolio_analytics)
+                        # Queue portfolio analytics record
+                        analytics_rows.append({
+                            "account_id": account_id,
+                            "timestamp": datetime.now(),
+                            "total_value": total_value,
+                            "daily_change": daily_change,
+                            "positions": positions
+                        })
                 
                 except Exception as account_error:
                     logger.error(f"❌ Failed to sync portfolio for account {account_id}: {account_error}")
                     continue
             
-            await session.commit()
+            await bulk_insert_analytics(session, analytics_rows)
             
             logger.info(f"✅ E*TRADE portfolio synchronization completed for {len(accounts)} accounts")
             return {
@@ -506,7 +625,7 @@ async def execute_etrade_trades(self):
             return {"status": "skipped", "message": "Auto-trading disabled"}
         
         await init_database()
-        async with get_db_session().__anext__() as session:
+        async with session_scope() as session:
             # Get user preferences
             result = await session.execute(select(UserPreferences).limit(1))
             user_preferences = result.scalar_one_or_none()
@@ -549,8 +668,15 @@ async def execute_etrade_trades(self):
             # Execute trades
             trades_executed = 0
             
-            # Initialize E*TRADE order service
-            etrade_order_service = ETradeOrderService(etrade_auth)
+            # Fetch the portfolio once so SELL decisions check held positions with a dict lookup
+            positions_by_symbol = {}
+            if any(decision.decision_type == DecisionType.SELL for decision in ai_decisions):
+                portfolio_data = etrade_account_service.get_portfolio(account_id_key)
+                positions_by_symbol = {
+                    position.get("symbolDescription", ""): int(position.get("quantity", 0))
+                    for account_portfolio in portfolio_data.get("AccountPortfolio", [])
+                    for position in account_portfolio.get("Position", [])
+                }
             
             for decision in ai_decisions:
                 try:
@@ -561,25 +687,12 @@ async def execute_etrade_trades(self):
                     
                     # For SELL orders, check if we have the position
                     if order_action == "SELL":
-                        # Get current portfolio to check if we have the position
-                        portfolio_data = etrade_account_service.get_portfolio(account_id_key)
-                        position_found = False
-                        
-                        if "AccountPortfolio" in portfolio_data:
-                            for account_portfolio in portfolio_data["AccountPortfolio"]:
-                                if "Position" in account_portfolio:
-                                    for position in account_portfolio["Position"]:
-                                        if position.get("symbolDescription", "") == symbol:
-                                            position_found = True
-                                            # Use the actual quantity from the position for selling
-                                            quantity = min(quantity, int(position.get("quantity", 0)))
-                                            break
-                                if position_found:
-                                    break
-                        
-                        if not position_found:
+                        position_quantity = positions_by_symbol.get(symbol)
+                        if not position_quantity:
                             logger.info(f"ℹ️ No position found for {symbol}, skipping SELL order")
                             continue
+                        # Use the actual quantity from the position for selling
+                        quantity = min(quantity, position_quantity)
                     
                     # Preview the order
                     preview = etrade_order_service.preview_equity_order(
@@ -604,8 +717,6 @@ async def execute_etrade_trades(self):
                     # In a real implementation, you would get the actual execution price from the order response
                     # decision.outcome_value = Decimal(str(execution_price))
                     
-                    await session.commit()
-                    
                     trades_executed += 1
                     logger.info(f"✅ Executed {order_action} order for {symbol} (quantity: {quantity})")
                     
@@ -629,7 +740,9 @@ async def execute_etrade_trades(self):
 @celery_app.task(bind=True, base=AsyncTask)
 async def manual_backup(self):
     """Manually trigger database backup."""
-    return await backup_database.run()
+    # Hand the backup to the broker so it runs on the backup worker, serialized with nightly backups
+    result = backup_database.apply_async(queue='backup')
+    return {"status": "queued", "task_id": result.id}
 
 
 @celery_app.task(bind=True, base=AsyncTask)
@@ -639,7 +752,7 @@ async def analyze_symbol_background(self, symbol: str):
         logger.info(f"🤖 Background analysis for {symbol}...")
         
         await init_database()
-        async with get_db_session().__anext__() as session:
+        async with session_scope() as session:
             # Get user preferences
             result = await session.execute(select(UserPreferences).limit(1))
             user_preferences = result.scalar_one_or_none()
@@ -647,10 +760,18 @@ async def analyze_symbol_background(self, symbol: str):
             if not user_preferences:
                 return {"status": "error", "message": "User preferences not found"}
             
-            # Gather market data
-            quote_data = await market_service.get_real_time_quote(symbol)
-            historical_data = await market_service.get_historical_data(symbol)
-            news_headlines = await market_service.get_news_headlines(symbol, limit=5)
+            # Gather market data concurrently; only the quote is required for the analysis
+            quote_data, historical_data, news_headlines = await asyncio.gather(
+                market_service.get_real_time_quote(symbol),
+                market_service.get_historical_data(symbol),
+                market_service.get_news_headlines(symbol, limit=5),
+                return_exceptions=True
+            )
+            if isinstance(quote_data, Exception):
+                raise quote_data
+            if isinstance(news_headlines, Exception):
+                logger.warning(f"⚠️ News headlines unavailable for {symbol}: {news_headlines}")
+                news_headlines = []
             
             # Analyze sentiment
             sentiment_score, sentiment_summary = await ai_service.analyze_market_sentiment(
@@ -676,7 +797,6 @@ async def analyze_symbol_background(self, symbol: str):
             
             if ai_decision:
                 session.add(ai_decision)
-                await session.commit()
                 
                 return {
                     "status": "success",
@@ -687,7 +807,6 @@ async def analyze_symbol_background(self, symbol: str):
                     "sentiment_score": sentiment_score
                 }
             else:
-                await session.commit()
                 return {
                     "status": "success",
                     "symbol": symbol,
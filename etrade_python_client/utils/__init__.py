@@ -1,5 +1,6 @@
 """Utility functions and helpers for AI trading assistant."""
 
-from .config_manager import ConfigManager
+from .config_manager import ConfigManager, get_config_manager
+from .logging_utils import LazyJson
 
-__all__ = ['ConfigManager']
\ No newline at end of file
+__all__ = ['ConfigManager', 'get_config_manager', 'LazyJson']
\ No newline at end of file
@@ -2,16 +2,28 @@
 
 import os
 import configparser
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 from decimal import Decimal
 
 
+# Sentinel for required keys in _cached; None cannot mark them since it is a valid fallback
+_NO_FALLBACK = object()
+
+
+def _is_true(value: str) -> bool:
+    """Parse a 'true'/'false' config flag."""
+    return value.lower() == 'true'
+
+
 class ConfigManager:
     """Enhanced configuration manager that extends existing config.ini patterns."""
     
     def __init__(self, config_path: Optional[str] = None):
         self.config = configparser.ConfigParser()
+        # Parsed getter values keyed by (section, key); cleared whenever the config changes
+        self._cache: Dict[Tuple[str, str], Any] = {}
         
         # Default to existing config.ini location
         if config_path is None:
@@ -27,6 +39,32 @@ class ConfigManager:
         else:
             # Create default configuration if it doesn't exist
             self.create_default_config()
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drop cached getter values so the next calls re-read the loaded configuration."""
+        self._cache.clear()
+    
+    def _cached(
+        self,
+        section: str,
+        key: str,
+        cast: Callable[[str], Any] = str,
+        fallback: Any = _NO_FALLBACK
+    ) -> Any:
+        """Return a config value converted with cast, parsing it only on first access."""
+        try:
+            return self._cache[(section, key)]
+        except KeyError:
+            pass
+        
+        if fallback is _NO_FALLBACK:
+            value = cast(self.config[section][key])
+        else:
+            raw = self.config.get(section, key, fallback=None)
+            value = fallback if raw is None else cast(raw)
+        self._cache[(section, key)] = value
+        return value
     
     def create_default_config(self):
         """Create default configuration with all required sections."""
@@ -41,7 +79,10 @@ class ConfigManager:
             'DATABASE_URL': 'sqlite:///./trading_assistant.db',
             'BACKUP_LOCATION': './backups/',
             'BACKUP_RETENTION_COUNT': '5',
-            'DATA_RETENTION_DAYS': '30'
+            'DATA_RETENTION_DAYS': '30',
+            'POOL_SIZE': '10',
+            'MAX_OVERFLOW': '20',
+            'POOL_RECYCLE_SECONDS': '1800'
         }
         
         self.config['AI_SERVICES'] = {
@@ -86,84 +127,93 @@ class ConfigManager:
     
     # E*TRADE API Configuration
     def get_consumer_key(self) -> str:
-        return self.config['DEFAULT']['CONSUMER_KEY']
+        return self._cached('DEFAULT', 'CONSUMER_KEY')
     
     def get_consumer_secret(self) -> str:
-        return self.config['DEFAULT']['CONSUMER_SECRET']
+        return self._cached('DEFAULT', 'CONSUMER_SECRET')
     
     def get_sandbox_base_url(self) -> str:
-        return self.config['DEFAULT']['SANDBOX_BASE_URL']
+        return self._cached('DEFAULT', 'SANDBOX_BASE_URL')
     
     def get_prod_base_url(self) -> str:
-        return self.config['DEFAULT']['PROD_BASE_URL']
+        return self._cached('DEFAULT', 'PROD_BASE_URL')
     
     # Database Configuration
     def get_database_url(self) -> str:
-        return self.config['DATABASE']['DATABASE_URL']
+        return self._cached('DATABASE', 'DATABASE_URL')
     
     def get_backup_location(self) -> str:
-        return self.config['DATABASE']['BACKUP_LOCATION']
+        return self._cached('DATABASE', 'BACKUP_LOCATION')
     
     def get_backup_retention_count(self) -> int:
-        return int(self.config['DATABASE']['BACKUP_RETENTION_COUNT'])
+        return self._cached('DATABASE', 'BACKUP_RETENTION_COUNT', int)
     
     def get_data_retention_days(self) -> int:
-        return int(self.config['DATABASE']['DATA_RETENTION_DAYS'])
+        return self._cached('DATABASE', 'DATA_RETENTION_DAYS', int)
+    
+    def get_db_pool_size(self) -> int:
+        return self._cached('DATABASE', 'POOL_SIZE', int, fallback=10)
+    
+    def get_db_max_overflow(self) -> int:
+        return self._cached('DATABASE', 'MAX_OVERFLOW', int, fallback=20)
+    
+    def get_db_pool_recycle(self) -> int:
+        return self._cached('DATABASE', 'POOL_RECYCLE_SECONDS', int, fallback=1800)
     
     # AI Services Configuration
     def get_gemini_api_key(self) -> str:
-        return self.config['AI_SERVICES']['GEMINI_API_KEY']
+        return self._cached('AI_SERVICES', 'GEMINI_API_KEY')
     
     def get_max_trade_amount(self) -> Decimal:
-        return Decimal(self.config['AI_SERVICES']['MAX_TRADE_AMOUNT'])
+        return self._cached('AI_SERVICES', 'MAX_TRADE_AMOUNT', Decimal)
     
     def get_ai_confidence_threshold(self) -> float:
-        return float(self.config['AI_SERVICES']['AI_CONFIDENCE_THRESHOLD'])
+        return self._cached('AI_SERVICES', 'AI_CONFIDENCE_THRESHOLD', float)
     
     def is_auto_trading_enabled(self) -> bool:
-        return self.config['AI_SERVICES']['AUTO_TRADING_ENABLED'].lower() == 'true'
+        return self._cached('AI_SERVICES', 'AUTO_TRADING_ENABLED', _is_true)
     
     # Notification Configuration
     def get_email_smtp_server(self) -> str:
-        return self.config['NOTIFICATIONS']['EMAIL_SMTP_SERVER']
+        return self._cached('NOTIFICATIONS', 'EMAIL_SMTP_SERVER')
     
     def get_email_smtp_port(self) -> int:
-        return int(self.config['NOTIFICATIONS']['EMAIL_SMTP_PORT'])
+        return self._cached('NOTIFICATIONS', 'EMAIL_SMTP_PORT', int)
     
     def get_email_username(self) -> str:
-        return self.config['NOTIFICATIONS']['EMAIL_USERNAME']
+        return self._cached('NOTIFICATIONS', 'EMAIL_USERNAME')
     
     def get_email_password(self) -> str:
-        return self.config['NOTIFICATIONS']['EMAIL_PASSWORD']
+        return self._cached('NOTIFICATIONS', 'EMAIL_PASSWORD')
     
     def get_slack_token(self) -> str:
-        return self.config['NOTIFICATIONS']['SLACK_TOKEN']
+        return self._cached('NOTIFICATIONS', 'SLACK_TOKEN')
     
     def get_slack_channel(self) -> str:
-        return self.config['NOTIFICATIONS']['SLACK_CHANNEL']
+        return self._cached('NOTIFICATIONS', 'SLACK_CHANNEL')
     
     # Web App Configuration
     def get_web_app_host(self) -> str:
-        return self.config['WEB_APP']['HOST']
+        return self._cached('WEB_APP', 'HOST')
     
     def get_web_app_port(self) -> int:
-        return int(self.config['WEB_APP']['PORT'])
+        return self._cached('WEB_APP', 'PORT', int)
     
     def is_debug_enabled(self) -> bool:
-        return self.config['WEB_APP']['DEBUG'].lower() == 'true'
+        return self._cached('WEB_APP', 'DEBUG', _is_true)
     
     def get_secret_key(self) -> str:
-        return self.config['WEB_APP']['SECRET_KEY']
+        return self._cached('WEB_APP', 'SECRET_KEY')
     
     # Celery Configuration
     def get_celery_broker_url(self) -> str:
-        return os.environ.get('REDIS_URL', self.config['CELERY']['BROKER_URL'])
+        return os.environ.get('REDIS_URL', self._cached('CELERY', 'BROKER_URL'))
     
     def get_celery_result_backend(self) -> str:
-        return os.environ.get('REDIS_URL', self.config['CELERY']['RESULT_BACKEND'])
+        return os.environ.get('REDIS_URL', self._cached('CELERY', 'RESULT_BACKEND'))
     
     def get_celery_timezone(self) -> str:
-        return self.config['CELERY']['TIMEZONE']
+        return self._cached('CELERY', 'TIMEZONE')
     
     # Utility methods
     def get_section(self, section_name: str) -> Dict[str, str]:
@@ -177,8 +227,15 @@ class ConfigManager:
         if section not in self.config:
             self.config[section] = {}
         self.config[section][key] = value
+        self.invalidate()
         self.save_config()
     
     def get_value(self, section: str, key: str, default: str = '') -> str:
         """Get a configuration value with optional default."""
-        return self.config.get(section, key, fallback=default)
\ No newline at end of file
+        return self.config.get(section, key, fallback=default)
+
+
+@lru_cache(maxsize=1)
+def get_config_manager() -> ConfigManager:
+    """Return the process-wide ConfigManager, loading config.ini on first use."""
+    return ConfigManager()
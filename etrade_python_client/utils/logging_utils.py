@@ -0,0 +1,19 @@
+"""Logging helpers for AI trading assistant."""
+
+from typing import Any
+
+import orjson
+
+
+class LazyJson:
+    """Log argument that pretty-prints JSON only when the record is actually emitted."""
+    
+    __slots__ = ("data",)
+    
+    def __init__(self, data: Any):
+        self.data = data
+    
+    def __str__(self) -> str:
+        return orjson.dumps(
+            self.data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS, default=str
+        ).decode()
@@ -21,10 +21,10 @@ from ..database.models import (
     PortfolioAnalytics, AIDecision, UserPreferences, MarketSentiment,
     DecisionType, RiskTolerance, UserFeedback
 )
-from ..utils.config_manager import ConfigManager
+from ..utils.config_manager import get_config_manager
 from ..services.ai_trading_service import AITradingService
 from ..services.market_data_service import MarketDataService
-from ..services.notification_service import notification_service
+from ..services.notification_service import close_notification_service, get_notification_service
 from ..services.etrade_auth import ETradeAuth
 from ..services.etrade_account_service import ETradeAccountService
 from ..services.etrade_order_service import ETradeOrderService
@@ -34,7 +34,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Configuration and services
-config_manager = ConfigManager()
+config_manager = get_config_manager()
 ai_service = AITradingService()
 market_service = MarketDataService()
 
@@ -64,6 +64,7 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Shutting down AI Trading Assistant...")
     await close_database()
     logger.info("✅ Database connections closed")
+    await close_notification_service()
 
 
 # FastAPI app instance
@@ -110,6 +111,8 @@ class AIDecisionResponse(BaseModel):
     user_feedback: Optional[UserFeedback] = None
     feedback_notes: Optional[str] = None
     price_target: Optional[Decimal] = None
+    sentiment_score_at_decision: Optional[float] = None
+    portfolio_value_at_decision: Optional[Decimal] = None
 
     class Config:
         from_attributes = True
@@ -308,6 +311,7 @@ async def submit_decision_feedback(
     decision.feedback_notes = feedback.feedback_notes
     decision.feedback_timestamp = datetime.now()
     
+    # Commit before broadcasting so listeners that refetch see the feedback
     await db.commit()
     
     # Broadcast feedback update via WebSocket
@@ -515,6 +519,7 @@ async def analyze_sentiment_batch(
         symbols = [s.upper() for s in symbols]
         
         sentiment_results = await market_service.analyze_market_sentiment_batch(symbols, db)
+        await db.commit()
         
         return {
             "analyzed_symbols": len(symbols),
@@ -580,7 +585,7 @@ async def test_trading_alert(
         }
         
         # Send notification
-        result = await notification_service.send_trading_alert(
+        result = await get_notification_service().send_trading_alert(
             decision=decision,
             market_data=market_data,
             recipients=request.recipients
@@ -602,7 +607,7 @@ async def test_trading_alert(
 async def send_system_alert(request: NotificationRequest):
     """Send a system alert notification."""
     try:
-        result = await notification_service.send_system_alert(
+        result = await get_notification_service().send_system_alert(
             title=request.title,
             message=request.message,
             severity=request.severity,
@@ -652,7 +657,7 @@ async def send_portfolio_summary_notification(
             )
         
         # Send notification
-        result = await notification_service.send_portfolio_summary(
+        result = await get_notification_service().send_portfolio_summary(
             analytics=analytics,
             recipients=recipients
         )
@@ -672,6 +677,7 @@ async def send_portfolio_summary_notification(
 async def get_notification_status():
     """Get notification service status."""
     try:
+        notification_service = get_notification_service()
         status = {
             "email_configured": notification_service.smtp_config is not None,
             "slack_configured": notification_service.slack_client is not None,
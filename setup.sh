@@ -479,15 +479,19 @@ start_manual_services() {
     echo "source venv/bin/activate"
     echo "celery -A etrade_python_client.services.celery_app worker --loglevel=info"
     echo
-    echo -e "${YELLOW}Terminal 3 - Celery Beat:${NC}"
+    echo -e "${YELLOW}Terminal 3 - Celery Backup Worker:${NC}"
+    echo "source venv/bin/activate"
+    echo "celery -A etrade_python_client.services.celery_app worker -Q backup --concurrency=1 --loglevel=info"
+    echo
+    echo -e "${YELLOW}Terminal 4 - Celery Beat:${NC}"
     echo "source venv/bin/activate"
     echo "celery -A etrade_python_client.services.celery_app beat --loglevel=info"
     echo
-    echo -e "${YELLOW}Terminal 4 - Backend API:${NC}"
+    echo -e "${YELLOW}Terminal 5 - Backend API:${NC}"
     echo "source venv/bin/activate"
     echo "python run_server.py"
     echo
-    echo -e "${YELLOW}Terminal 5 - Frontend:${NC}"
+    echo -e "${YELLOW}Terminal 6 - Frontend:${NC}"
     echo "cd frontend && npm start"
     echo
     echo -e "${GREEN}Once all services are running:${NC}"
@@ -0,0 +1,51 @@
+"""Tests for E*TRADE clientOrderId generation."""
+
+import multiprocessing
+import os
+import sys
+from itertools import islice
+
+# Add the project root to Python path
+project_root = os.path.dirname(__file__)
+sys.path.insert(0, project_root)
+
+from etrade_python_client.services import etrade_order_service
+from etrade_python_client.services.etrade_order_service import _new_client_order_ids
+
+# E*TRADE rejects clientOrderId values longer than 20 characters
+_MAX_CLIENT_ORDER_ID_LENGTH = 20
+
+
+def test_client_order_ids_fit_etrade_limit():
+    """Generated IDs are increasing and never longer than 20 characters."""
+    ids = list(islice(_new_client_order_ids(), 1000))
+    assert ids == sorted(set(ids))
+    assert all(len(str(order_id)) <= _MAX_CLIENT_ORDER_ID_LENGTH for order_id in ids)
+
+
+def test_concurrent_sequences_do_not_collide():
+    """Two sequences started in the same instant (e.g. two worker processes) do not share IDs."""
+    first = _new_client_order_ids()
+    second = _new_client_order_ids()
+    assert set(islice(first, 10000)).isdisjoint(islice(second, 10000))
+
+
+def _next_client_order_id(queue):
+    queue.put(next(etrade_order_service._client_order_ids))
+
+
+def test_forked_child_gets_its_own_sequence(monkeypatch):
+    """A forked child draws a fresh prefix instead of continuing the parent's copy of the sequence."""
+    next(etrade_order_service._client_order_ids)
+    # Only a sequence created after this point picks up the stubbed prefix draw
+    monkeypatch.setattr(etrade_order_service.secrets, "randbelow", lambda upper: 42)
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    child = context.Process(target=_next_client_order_id, args=(queue,))
+    child.start()
+    child_id = queue.get(timeout=10)
+    child.join()
+    
+    parent_id = next(etrade_order_service._client_order_ids)
+    assert str(child_id).startswith("1042")
+    assert child_id != parent_id
@@ -0,0 +1,144 @@
+"""Tests for model column types and in-place schema upgrades."""
+
+import os
+import sys
+from decimal import Decimal
+
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select, text
+from sqlalchemy.orm import Session
+
+# Add the project root to Python path
+project_root = os.path.dirname(__file__)
+sys.path.insert(0, project_root)
+
+from etrade_python_client.database.models import (
+    AIDecision, Base, Cents, DecisionType, PortfolioAnalytics, UserFeedback, uuid7
+)
+from etrade_python_client.database.schema_upgrade import upgrade_schema
+
+
+def test_cents_round_trip():
+    """Money values survive a write and read through the Cents column unchanged."""
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    amounts = Table(
+        "amounts", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("amount", Cents, nullable=True)
+    )
+    metadata.create_all(engine)
+    
+    values = [Decimal("25000.50"), Decimal("-125.75"), Decimal("0.01"), Decimal("0"), 0.1 + 0.2, None]
+    with engine.begin() as conn:
+        conn.execute(insert(amounts), [{"id": i, "amount": value} for i, value in enumerate(values)])
+        stored = conn.execute(text("SELECT amount FROM amounts ORDER BY id")).scalars().all()
+        loaded = conn.execute(select(amounts.c.amount).order_by(amounts.c.id)).scalars().all()
+    
+    assert stored == [2500050, -12575, 1, 0, 30, None]
+    assert loaded == [Decimal("25000.50"), Decimal("-125.75"), Decimal("0.01"), Decimal("0.00"), Decimal("0.30"), None]
+    assert all(value is None or value.as_tuple().exponent == -2 for value in loaded)
+
+
+def test_cents_rounds_half_up():
+    """Sub-cent amounts are rounded half up when bound."""
+    cents = Cents()
+    assert cents.process_bind_param(Decimal("1.005"), None) == 101
+    assert cents.process_bind_param(Decimal("-1.005"), None) == -101
+    assert cents.process_bind_param(None, None) is None
+
+
+def test_upgrade_converts_legacy_money_columns():
+    """A DECIMAL-era portfolio_analytics table is renamed to *_cents columns holding cents."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE portfolio_analytics ("
+            "portfolio_id VARCHAR(36) NOT NULL PRIMARY KEY, account_id VARCHAR(100) NOT NULL, "
+            "timestamp DATETIME NOT NULL, total_value DECIMAL(15, 2) NOT NULL, "
+            "daily_change DECIMAL(15, 2) NOT NULL, positions JSON NOT NULL, "
+            "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO portfolio_analytics (portfolio_id, account_id, timestamp, total_value, daily_change, positions) "
+            "VALUES ('p1', 'acct', '2024-01-02 00:00:00', 25000.50, -125.75, '{}')"
+        ))
+        Base.metadata.create_all(conn)
+        upgrade_schema(conn)
+        # A second run must be a no-op
+        upgrade_schema(conn)
+        
+        row = conn.execute(text(
+            "SELECT total_value_cents, daily_change_cents FROM portfolio_analytics"
+        )).one()
+    
+    assert tuple(row) == (2500050, -12575)
+
+
+def test_upgraded_portfolio_analytics_orm_round_trip():
+    """Rescaled legacy rows read back as the original amounts and can be updated through the ORM."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE portfolio_analytics ("
+            "portfolio_id VARCHAR(36) NOT NULL PRIMARY KEY, account_id VARCHAR(100) NOT NULL, "
+            "timestamp DATETIME NOT NULL, total_value DECIMAL(15, 2) NOT NULL, "
+            "daily_change DECIMAL(15, 2) NOT NULL, positions JSON NOT NULL, "
+            "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO portfolio_analytics (portfolio_id, account_id, timestamp, total_value, daily_change, positions) "
+            "VALUES ('0199541b2f6a7c3e8a1b2c3d4e5f6a7b', 'acct', '2025-09-15 16:09:29.086658', 25000.50, -125.75, '{}')"
+        ))
+        # Older versions wrote timestamps through SQLAlchemy, with microseconds
+        Base.metadata.create_all(conn)
+        upgrade_schema(conn)
+    
+    with Session(engine) as session, session.begin():
+        snapshot = session.execute(select(PortfolioAnalytics)).scalar_one()
+        assert snapshot.total_value == Decimal("25000.50")
+        assert snapshot.daily_change == Decimal("-125.75")
+        snapshot.total_value = snapshot.total_value + Decimal("100.25")
+        snapshot.daily_change = Decimal("-25.50")
+    
+    with Session(engine) as session:
+        snapshot = session.execute(select(PortfolioAnalytics)).scalar_one()
+        assert (snapshot.total_value, snapshot.daily_change) == (Decimal("25100.75"), Decimal("-25.50"))
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT total_value_cents, daily_change_cents FROM portfolio_analytics")).one()
+    assert tuple(row) == (2510075, -2550)
+
+
+def test_ai_decision_update_matches_stored_row():
+    """Decisions loaded back from SQLite can be updated despite created_at being part of the primary key."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Row written the way older versions stored it, by CURRENT_TIMESTAMP
+        conn.execute(text(
+            "INSERT INTO ai_decisions (decision_id, symbol, decision_type, confidence_score, rationale, created_at) "
+            "VALUES ('0199541b2f6a7c3e8a1b2c3d4e5f6a7b', 'MSFT', 'HOLD', 0.5, 'legacy row', '2025-09-15 23:09:29')"
+        ))
+    
+    with Session(engine) as session, session.begin():
+        session.add_all([
+            AIDecision(decision_id=uuid7(), symbol="AAPL", decision_type=DecisionType.BUY,
+                       confidence_score=0.9, rationale="server default created_at"),
+            AIDecision(decision_id=uuid7(), symbol="TSLA", decision_type=DecisionType.SELL,
+                       confidence_score=0.7, rationale="explicit created_at",
+                       created_at=datetime(2025, 9, 16, 4, 0, 21, 123456))
+        ])
+    
+    executed_at = datetime(2025, 9, 17, 9, 30)
+    with Session(engine) as session, session.begin():
+        decisions = session.execute(select(AIDecision)).scalars().all()
+        assert len(decisions) == 3
+        for decision in decisions:
+            decision.user_feedback = UserFeedback.GOOD
+            decision.executed_at = executed_at
+    
+    with Session(engine) as session:
+        decisions = session.execute(select(AIDecision)).scalars().all()
+        assert {decision.user_feedback for decision in decisions} == {UserFeedback.GOOD}
+        assert {decision.executed_at for decision in decisions} == {executed_at}